@@ -0,0 +1,121 @@
+"""
+Shared OpenAI Batch API helpers for the lab solutions.
+
+Submitting, polling and reading back a batch is the same for every lab that
+uses the Batch API, so it lives here. Requests are built against the shared
+client's model and temperature, so batch runs never drift from the
+interactive ones.
+
+Failed requests are reported per request rather than aborting the run: a
+batch that partly fails, or ends as expired or cancelled, still returns
+every reply that finished.
+"""
+
+import io
+import json
+import time
+
+from openai import OpenAI
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - dependency optional
+    _ORJSON_AVAILABLE = False
+
+from shared_llm import llm
+
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# Batch output files hold one JSON record per request; orjson decodes them
+# several times faster than the stdlib when it is installed
+_loads = orjson.loads if _ORJSON_AVAILABLE else json.loads
+
+
+def chat_request(custom_id: str, messages: list[dict],
+                 response_format: dict | None = None) -> dict:
+    """Build one /v1/chat/completions batch request for the shared client's model."""
+    body = {
+        "model": llm.model_name,
+        "temperature": llm.temperature,
+        "messages": messages
+    }
+    if response_format:
+        body["response_format"] = response_format
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": body
+    }
+
+
+def _record_error(record: dict) -> str | None:
+    """Return the error message of a batch output or error record, or None on success."""
+    if record.get("error"):
+        error = record["error"]
+        return error.get("message", str(error)) if isinstance(error, dict) else str(error)
+    response = record.get("response") or {}
+    if response.get("status_code") != 200:
+        error = (response.get("body") or {}).get("error") or {}
+        return error.get("message") or f"HTTP {response.get('status_code')}"
+    return None
+
+
+def run_batch(client: OpenAI, requests: list[dict], name: str,
+              poll_interval: float = 30.0) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Submit chat requests as one batch and wait for the results.
+
+    Args:
+        client: OpenAI client
+        requests: Requests built with chat_request; custom_ids must be unique
+        name: Label for the upload file and progress output
+        poll_interval: Seconds between batch status checks
+
+    Returns:
+        (replies, errors): custom_id -> reply content, and custom_id -> error
+        message for every request that did not produce a reply
+
+    Raises:
+        RuntimeError: If the batch produced neither an output nor an error file
+    """
+    payload = "\n".join(json.dumps(request) for request in requests).encode()
+    batch_file = client.files.create(file=(f"{name}.jsonl", io.BytesIO(payload)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"[{name}] Submitted batch {batch.id} ({len(requests)} requests)")
+
+    while batch.status not in TERMINAL_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        print(f"[{name}] Batch status: {batch.status}")
+
+    if not batch.output_file_id and not batch.error_file_id:
+        raise RuntimeError(f"Batch {batch.id} for '{name}' ended with status {batch.status} and no results")
+    if batch.status != "completed":
+        print(f"[{name}] Batch {batch.id} ended with status {batch.status}; keeping partial results")
+
+    replies, errors = {}, {}
+    # Successful requests land in the output file, failed ones in the error
+    # file; either can be missing
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            record = _loads(line)
+            error = _record_error(record)
+            if error is None:
+                replies[record["custom_id"]] = record["response"]["body"]["choices"][0]["message"]["content"]
+            else:
+                errors[record["custom_id"]] = error
+
+    for request in requests:
+        custom_id = request["custom_id"]
+        if custom_id not in replies and custom_id not in errors:
+            errors[custom_id] = f"no result (batch {batch.status})"
+
+    return replies, errors
@@ -0,0 +1,183 @@
+"""
+Offline bulk compliance analysis with the OpenAI Batch API.
+
+Runs the same prompts as the Lab 4 compliance agent, but submits them through
+the Batch API, which is billed at half the price of regular requests and is
+not limited by per-minute request quotas. Results arrive within 24 hours, so
+this is meant for non-interactive jobs such as nightly re-scans.
+
+The summary depends on the analysis, so documents move through the pipeline
+in two waves: combined analysis -> summary. Routing is decided locally
+between the two.
+
+Usage:
+    python compliance_batch.py path/to/doc1.txt path/to/doc2.txt ...
+
+Requirements:
+    - OpenAI API key in .env
+    - openai, langchain, langgraph, langchain-openai packages
+    - orjson (optional, faster parsing of batch results; see batch_api.py)
+"""
+
+import sys
+from pathlib import Path
+
+from openai import OpenAI
+from pydantic import ValidationError
+
+from batch_api import chat_request, run_batch
+from lab4_capstone_compliance_agent import (
+    ComplianceState,
+    AnalysisSchema, SummarySchema,
+    response_format_for,
+    analyze_messages, analysis_update, merge_entities,
+    summary_messages, summary_update, template_summary,
+    determine_routing,
+    initial_state,
+    print_results,
+)
+
+# LangChain message types -> OpenAI chat roles
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+# =============================================================================
+# Batch Helpers
+# =============================================================================
+
+def build_batch_requests(states: list[ComplianceState], stage: str, build_messages,
+                         response_format: dict | None = None) -> list[dict]:
+    """
+    Build the Batch API requests for one stage, one per document.
+
+    Args:
+        states: Current state of every document in this wave
+        stage: Stage name, used in each request's custom_id
+        build_messages: The lab's prompt builder for this stage
+        response_format: Optional response_format for every request
+
+    Returns:
+        Requests ready for batch_api.run_batch
+    """
+    return [
+        chat_request(
+            f"{state['document_id']}:{stage}",
+            [{"role": _ROLES[m.type], "content": m.content} for m in build_messages(state)],
+            response_format,
+        )
+        for state in states
+    ]
+
+
+def run_batch_wave(client: OpenAI, states: list[ComplianceState], stage: str,
+                   build_messages, poll_interval: float = 30.0,
+                   response_format: dict | None = None) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Submit one stage for all documents and wait for the results.
+
+    A batch that ends early (expired, cancelled) still returns whatever
+    finished; every document without a reply gets an error instead.
+
+    Returns:
+        (replies, errors): document_id -> the model's reply for this stage,
+        and document_id -> error message for documents that failed
+    """
+    requests = build_batch_requests(states, stage, build_messages, response_format)
+    try:
+        replies, errors = run_batch(client, requests, stage, poll_interval)
+    except RuntimeError as e:
+        return {}, {state["document_id"]: str(e) for state in states}
+
+    # custom_id is "<document_id>:<stage>"
+    return (
+        {key.rsplit(":", 1)[0]: reply for key, reply in replies.items()},
+        {key.rsplit(":", 1)[0]: error for key, error in errors.items()},
+    )
+
+
+def _mark_failed(state: ComplianceState, stage: str, error: str) -> None:
+    """Flag a document whose stage failed so it goes to the review queue."""
+    state.update({
+        "requires_human_review": True,
+        "human_review_reason": f"{stage} failed: {error}",
+        "processing_status": "failed",
+    })
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+def batch_analyze_documents(docs: list[tuple[str, str]], poll_interval: float = 30.0) -> list[dict]:
+    """
+    Analyze documents through the Batch API.
+
+    Documents that need human review are flagged in the result but not
+    paused; route them to a review queue after the run. Documents whose
+    requests fail are returned with processing_status "failed" and the
+    error in human_review_reason, without stopping the rest of the run.
+
+    Args:
+        docs: (document_text, document_id) pairs; ids must be unique
+        poll_interval: Seconds between batch status checks
+
+    Returns:
+        Final states, in the same order as ``docs``
+    """
+    client = OpenAI()
+    states = [initial_state(text, doc_id) for text, doc_id in docs]
+
+    replies, errors = run_batch_wave(client, states, "analyze_all", analyze_messages, poll_interval,
+                                     response_format=response_format_for(AnalysisSchema))
+    analyzed = []
+    for state in states:
+        document_id = state["document_id"]
+        try:
+            analysis = AnalysisSchema.model_validate_json(replies[document_id])
+        except KeyError:
+            _mark_failed(state, "analyze_all", errors[document_id])
+            continue
+        except ValidationError as e:
+            _mark_failed(state, "analyze_all", f"invalid reply: {e}")
+            continue
+        state.update(merge_entities(state, analysis_update(analysis)))
+        state.update(determine_routing(state))
+        analyzed.append(state)
+
+    # Clean low-risk documents get their summary locally
+    pending = []
+    for state in analyzed:
+        template = template_summary(state)
+        if template is None:
+            pending.append(state)
+        else:
+            state.update(template)
+    if not pending:
+        return states
+
+    replies, errors = run_batch_wave(client, pending, "generate_summary", summary_messages, poll_interval,
+                                     response_format=response_format_for(SummarySchema))
+    for state in pending:
+        document_id = state["document_id"]
+        try:
+            summary = SummarySchema.model_validate_json(replies[document_id])
+        except KeyError:
+            _mark_failed(state, "generate_summary", errors[document_id])
+            continue
+        except ValidationError as e:
+            _mark_failed(state, "generate_summary", f"invalid reply: {e}")
+            continue
+        state.update(summary_update(summary))
+
+    return states
+
+
+if __name__ == "__main__":
+    paths = [Path(arg) for arg in sys.argv[1:]]
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+
+    results = batch_analyze_documents([(path.read_text(), path.stem) for path in paths])
+    for result in results:
+        print_results(result)
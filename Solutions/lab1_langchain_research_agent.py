@@ -4,22 +4,51 @@ Lab 1 Solution: LangChain Research Agent
 A complete research assistant agent with tools, memory, and debugging.
 """
 
+import argparse
 import ast
+import asyncio
 import operator
 import os
-from datetime import datetime
+import re
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_react_agent
 from langchain.tools import tool
 from langchain import hub
 from langchain.memory import ConversationBufferMemory
+from openai import OpenAI
+from batch_api import chat_request, run_batch
+from shared_llm import llm
 
 # Load environment
 load_dotenv()
 
-# Storage for notes
-notes_storage = []
+# Storage for notes, as (date, time_ns, content) tuples
+notes_storage = deque()
+
+# Findings section of summarize_research, one entry per save_note; joined
+# on demand so each save is O(1) rather than copying the whole summary
+_findings: list[str] = []
+
+
+# Today's date string and the time.time_ns() at which it goes stale (midnight)
+_today = ""
+_today_expires_ns = 0
+
+
+def _today_str() -> str:
+    """Return today's date as YYYY-MM-DD, recomputing it only after midnight."""
+    global _today, _today_expires_ns
+
+    if time.time_ns() >= _today_expires_ns:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        _today = now.strftime("%Y-%m-%d")
+        _today_expires_ns = int(midnight.timestamp() * 1_000_000_000)
+    return _today
 
 
 # ============ TOOLS ============
@@ -30,9 +59,17 @@ _MATH_OPS = {ast.Add: operator.add, ast.Sub: operator.sub,
              ast.Mult: operator.mul, ast.Div: operator.truediv,
              ast.Pow: operator.pow, ast.USub: operator.neg}
 
+# Cheap pre-check so obviously invalid input is rejected without parsing
+_VALID_EXPR = re.compile(r"[\d\s+\-*/.()eE_]+")
 
+
+@lru_cache(maxsize=256)
 def _safe_math(expr: str):
-    """Evaluate a math expression safely using AST parsing."""
+    """Evaluate a math expression safely using AST parsing.
+
+    Results are cached per expression, since agents often repeat the same
+    calculation within a session.
+    """
     def _eval(node):
         if isinstance(node, ast.Expression):
             return _eval(node.body)
@@ -53,6 +90,8 @@ def calculator(expression: str) -> str:
     Args:
         expression: A mathematical expression like '2 + 2' or '15 * 7'
     """
+    if not _VALID_EXPR.fullmatch(expression):
+        return "Error: Invalid characters in expression"
     try:
         result = _safe_math(expression)
         return f"The result of {expression} is {result}"
@@ -74,10 +113,8 @@ def save_note(note: str) -> str:
     Args:
         note: The note content to save
     """
-    notes_storage.append({
-        "content": note,
-        "timestamp": datetime.now().isoformat()
-    })
+    notes_storage.append((_today_str(), time.time_ns(), note))
+    _findings.append(f"Finding {len(notes_storage)}:\n{note}\n\n")
     return f"Note saved! You now have {len(notes_storage)} note(s)."
 
 
@@ -87,10 +124,10 @@ def get_notes() -> str:
     if not notes_storage:
         return "No notes saved yet."
 
-    result = "Saved notes:\n"
-    for i, note in enumerate(notes_storage, 1):
-        result += f"\n{i}. [{note['timestamp'][:10]}] {note['content']}"
-    return result
+    return "Saved notes:\n" + "".join(
+        f"\n{i}. [{date}] {content}"
+        for i, (date, _, content) in enumerate(notes_storage, 1)
+    )
 
 
 @tool
@@ -102,14 +139,12 @@ def summarize_research() -> str:
     if not notes_storage:
         return "No notes to summarize. Save some notes first."
 
-    result = "Research Summary:\n"
-    result += "=" * 40 + "\n"
-    result += f"Total findings: {len(notes_storage)}\n\n"
-
-    for i, note in enumerate(notes_storage, 1):
-        result += f"Finding {i}:\n{note['content']}\n\n"
-
-    return result
+    return (
+        "Research Summary:\n"
+        + "=" * 40 + "\n"
+        + f"Total findings: {len(notes_storage)}\n\n"
+        + "".join(_findings)
+    )
 
 
 @tool
@@ -129,15 +164,15 @@ def web_search(query: str) -> str:
 Note: This is simulated. Configure TAVILY_API_KEY for real search."""
 
 
+@lru_cache(maxsize=1)
+def _react_chat_prompt():
+    """Fetch the conversational ReAct prompt from LangChain Hub once per process."""
+    return hub.pull("hwchase17/react-chat")
+
+
 def build_research_agent():
     """Build and return the research agent."""
 
-    # Initialize LLM
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0
-    )
-
     # Define tools
     tools = [
         calculator,
@@ -149,7 +184,7 @@ def build_research_agent():
     ]
 
     # Get conversational ReAct prompt
-    prompt = hub.pull("hwchase17/react-chat")
+    prompt = _react_chat_prompt()
 
     # Create memory
     memory = ConversationBufferMemory(
@@ -173,15 +208,75 @@ def build_research_agent():
     return executor
 
 
+async def run_queries_concurrently(queries: list[str]) -> list[dict]:
+    """Run independent queries at the same time.
+
+    Each query gets its own executor so the conversation memories don't
+    interleave; use this only for queries that don't depend on each other.
+    """
+    executors = [build_research_agent() for _ in queries]
+    return await asyncio.gather(*[
+        executor.ainvoke({"input": query})
+        for executor, query in zip(executors, queries)
+    ])
+
+
+def run_queries_batch(queries: list[str], poll_interval: float = 30.0) -> list[str]:
+    """Answer queries through the OpenAI Batch API at half the token price.
+
+    The Batch API runs plain chat completions, so the agent's tools and
+    memory are not available. Blocks until the batch finishes (up to 24h).
+    Queries whose request failed get an empty answer; the others are kept.
+    """
+    requests = [
+        chat_request(f"query-{i}", [{"role": "user", "content": query}])
+        for i, query in enumerate(queries)
+    ]
+    answers, errors = run_batch(OpenAI(), requests, "queries", poll_interval)
+    for custom_id, error in sorted(errors.items()):
+        print(f"{custom_id} failed: {error}")
+
+    return [answers.get(f"query-{i}", "") for i in range(len(queries))]
+
+
 def main():
     """Demo the research agent."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrent", action="store_true",
+                      help="run independent queries concurrently")
+    mode.add_argument("--batch", action="store_true",
+                      help="submit independent queries to the OpenAI Batch API")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Research Agent Demo")
     print("=" * 60)
 
+    if args.concurrent or args.batch:
+        # These queries don't rely on conversation memory
+        queries = [
+            "Search for information about Python async programming.",
+            "Calculate 15 * 7 + 23",
+            "What is today's date?",
+            "Search for information about LangChain agents."
+        ]
+        if args.batch:
+            outputs = run_queries_batch(queries)
+        else:
+            results = asyncio.run(run_queries_concurrently(queries))
+            outputs = [result["output"] for result in results]
+
+        for query, output in zip(queries, outputs):
+            print(f"\n{'='*60}")
+            print(f"Query: {query}")
+            print("=" * 60)
+            print(f"\nResponse: {output}")
+        return
+
     agent = build_research_agent()
 
-    # Demo queries
+    # Demo queries - these share memory, so they run one after another
     queries = [
         "My name is Alex. Search for information about Python async programming.",
         "Save a note: Python async uses asyncio library and await/async keywords",
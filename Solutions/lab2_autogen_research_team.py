@@ -5,6 +5,7 @@ A multi-agent research team using AutoGen's conversational approach.
 """
 
 import os
+import re
 from dotenv import load_dotenv
 from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
 
@@ -12,6 +13,17 @@ from autogen import AssistantAgent, UserProxyAgent, GroupChat, GroupChatManager
 load_dotenv()
 
 
+# The critic signs off with APPROVED / TERMINATE as the last word; a bare
+# substring test would also stop on "NOT APPROVED" or "cannot be APPROVED until"
+_DONE = re.compile(r"(?<!NOT )\b(?:APPROVED|TERMINATE)\W*$")
+
+
+def is_done(message: dict) -> bool:
+    """The chat is finished once the critic ends a reply with APPROVED or TERMINATE."""
+    content = message.get("content") or ""
+    return _DONE.search(content) is not None
+
+
 def build_research_team():
     """Build and return the AutoGen research team."""
 
@@ -69,21 +81,38 @@ def build_research_team():
         human_input_mode="NEVER",
         max_consecutive_auto_reply=0,
         code_execution_config=False,
-        is_termination_msg=lambda x: "TERMINATE" in x.get("content", "")
+        is_termination_msg=is_done
     )
 
+    def select_next_speaker(last_speaker, group_chat):
+        """Pass the work along Researcher -> Writer -> Critic.
+
+        The writer revises until the critic approves, and returning None
+        ends the chat right away instead of spending more rounds.
+        """
+        if last_speaker is user_proxy:
+            return researcher
+        if last_speaker is researcher:
+            return writer
+        if last_speaker is writer:
+            return critic
+        if is_done(group_chat.messages[-1]):
+            return None
+        return writer
+
     # Create group chat
     group_chat = GroupChat(
         agents=[user_proxy, researcher, writer, critic],
         messages=[],
         max_round=12,
-        speaker_selection_method="round_robin"
+        speaker_selection_method=select_next_speaker
     )
 
     # Create manager
     manager = GroupChatManager(
         groupchat=group_chat,
-        llm_config=llm_config
+        llm_config=llm_config,
+        is_termination_msg=is_done
     )
 
     return user_proxy, manager
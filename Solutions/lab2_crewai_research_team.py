@@ -12,8 +12,12 @@ from crewai import Agent, Task, Crew, Process
 load_dotenv()
 
 
-def build_research_crew(topic: str):
-    """Build and return a CrewAI research crew."""
+def build_research_crew():
+    """Build and return a CrewAI research crew.
+
+    Task descriptions use a {topic} placeholder that CrewAI fills in from
+    the kickoff inputs, so one crew can be reused for any number of topics.
+    """
 
     # Research Analyst Agent
     researcher = Agent(
@@ -52,22 +56,31 @@ def build_research_crew(topic: str):
     )
 
     # Define Tasks
-    research_task = Task(
-        description=f"""Research the topic: {topic}
-
-        Your research should include:
-        1. 3 key benefits with supporting evidence
-        2. 3 main challenges with context
-        3. Any relevant statistics or current trends
-        4. Expert opinions or insights
+    # The four research areas don't depend on each other, so each one is its
+    # own task with async_execution=True and they run concurrently. The
+    # writing task lists them all as context and waits for every one.
+    research_areas = [
+        ("3 key benefits with supporting evidence", "Three benefits with evidence"),
+        ("3 main challenges with context", "Three challenges with context"),
+        ("Any relevant statistics or current trends", "Relevant statistics and trends"),
+        ("Expert opinions or insights", "Expert opinions and insights"),
+    ]
+    research_tasks = [
+        Task(
+            description=f"""Research the topic: {{topic}}
+
+        Focus on: {focus}
 
         Provide structured, factual findings.""",
-        expected_output="A structured research summary with categorized findings",
-        agent=researcher
-    )
+            expected_output=output,
+            agent=researcher,
+            async_execution=True
+        )
+        for focus, output in research_areas
+    ]
 
     writing_task = Task(
-        description=f"""Using the research findings, write a compelling article about: {topic}
+        description="""Using the research findings, write a compelling article about: {topic}
 
         Requirements:
         - Under 300 words
@@ -76,7 +89,7 @@ def build_research_crew(topic: str):
         - Accessible to a general audience""",
         expected_output="A polished article under 300 words",
         agent=writer,
-        context=[research_task]
+        context=research_tasks
     )
 
     review_task = Task(
@@ -98,7 +111,7 @@ def build_research_crew(topic: str):
     # Create Crew
     crew = Crew(
         agents=[researcher, writer, critic],
-        tasks=[research_task, writing_task, review_task],
+        tasks=[*research_tasks, writing_task, review_task],
         process=Process.sequential,
         verbose=True
     )
@@ -112,8 +125,8 @@ def run_research_task(topic: str):
     print(f"Research Topic: {topic}")
     print("=" * 60)
 
-    crew = build_research_crew(topic)
-    result = crew.kickoff()
+    crew = build_research_crew()
+    result = crew.kickoff(inputs={"topic": topic})
 
     print("\n" + "=" * 60)
     print("FINAL OUTPUT:")
@@ -123,6 +136,14 @@ def run_research_task(topic: str):
     return result
 
 
+async def run_research_tasks(topics: list[str]):
+    """Run the crew on several topics concurrently."""
+    crew = build_research_crew()
+    return await crew.kickoff_for_each_async(
+        inputs=[{"topic": topic} for topic in topics]
+    )
+
+
 def main():
     """Demo the CrewAI research team."""
     topic = "The benefits and challenges of remote work for software developers"
@@ -4,19 +4,23 @@ Lab 3 Solution: LangGraph Document Processing Workflow
 A stateful workflow for document processing with conditional routing.
 """
 
+import asyncio
 import os
+from types import MappingProxyType
 from typing import TypedDict, Annotated, Literal
+from uuid import uuid4
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END, START
 from langgraph.checkpoint.memory import MemorySaver
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from shared_llm import llm
 
 # Load environment
 load_dotenv()
 
-# Initialize LLM
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# Shared checkpointer so thread state survives across process_document calls
+memory = MemorySaver()
 
 
 # ============ STATE DEFINITION ============
@@ -31,135 +35,137 @@ class DocumentState(TypedDict):
     response: str
 
 
-# ============ NODE FUNCTIONS ============
+class DocAnalysis(BaseModel):
+    """Structured output of the combined analysis step."""
+    doc_type: Literal["email", "report", "memo", "unknown"]
+    extracted_info: dict = Field(description="Key information extracted from the document")
+    urgency: Literal["high", "medium", "low"]
 
-def classify_document(state: DocumentState) -> dict:
-    """Classify the document type."""
-    document = state["document"]
 
-    messages = [
-        SystemMessage(content="""Classify the document type. Return ONLY one word:
-        - email (if it's an email or message)
-        - report (if it's a report or analysis)
-        - memo (if it's a memo or announcement)
-        - unknown (if unclear)"""),
-        HumanMessage(content=f"Document:\n{document}")
-    ]
+# Function calling accepts the free-form extracted_info object, which a
+# strict JSON schema would reject
+analyzer = llm.with_structured_output(DocAnalysis, method="function_calling")
 
-    response = llm.invoke(messages)
-    doc_type = response.content.strip().lower()
 
-    # Validate
-    if doc_type not in ["email", "report", "memo"]:
-        doc_type = "unknown"
+# ============ PROMPTS ============
 
-    print(f"[classify] Document type: {doc_type}")
-    return {"doc_type": doc_type}
+# System messages are built once so the static prefix of every request is
+# byte-identical across calls, which lets provider-side prompt caching hit.
+EXTRACTION_PROMPTS = MappingProxyType({
+    "email": "Extract: sender, recipient, subject, main request, deadline (if any)",
+    "report": "Extract: title, date, key findings, recommendations",
+    "memo": "Extract: from, to, subject, key points, action items",
+    "unknown": "Extract: main topic, key points, any action items"
+})
 
+ANALYZE_SYSTEM = SystemMessage(content="""Analyze the document and fill in every field.
 
-def extract_info(state: DocumentState) -> dict:
-    """Extract key information from the document."""
-    document = state["document"]
-    doc_type = state["doc_type"]
+doc_type - the document type:
+        - email (if it's an email or message)
+        - report (if it's a report or analysis)
+        - memo (if it's a memo or announcement)
+        - unknown (if unclear)
 
-    extraction_prompts = {
-        "email": "Extract: sender, recipient, subject, main request, deadline (if any)",
-        "report": "Extract: title, date, key findings, recommendations",
-        "memo": "Extract: from, to, subject, key points, action items",
-        "unknown": "Extract: main topic, key points, any action items"
-    }
+extracted_info - key information as a JSON object, depending on doc_type:
+""" + "\n".join(f"        - {t}: {p}" for t, p in EXTRACTION_PROMPTS.items()) + """
 
-    prompt = extraction_prompts.get(doc_type, extraction_prompts["unknown"])
+urgency - the urgency level:
+        - high (immediate action needed, critical issues, deadlines today)
+        - medium (action needed soon, important but not critical)
+        - low (informational, no immediate action needed)""")
 
-    messages = [
-        SystemMessage(content=f"You are an information extractor. {prompt}. Return as JSON."),
-        HumanMessage(content=f"Document:\n{document}")
-    ]
+SUMMARIZE_SYSTEM = SystemMessage(content="""Create a brief 2-3 sentence summary of the document.
+        Focus on the most important information.""")
 
-    response = llm.invoke(messages)
+URGENT_SYSTEM = SystemMessage(content="""This is an URGENT document. Create a brief response that:
+        1. Acknowledges the urgency
+        2. Outlines immediate next steps
+        3. Identifies who needs to be notified""")
+
+NORMAL_SYSTEM = SystemMessage(content="""Create a brief response that:
+        1. Acknowledges receipt
+        2. Notes key points
+        3. Suggests next steps if applicable""")
 
-    print(f"[extract] Extracted key information")
-    return {"extracted_info": {"raw": response.content}}
 
+# ============ NODE FUNCTIONS ============
 
-def determine_urgency(state: DocumentState) -> dict:
-    """Determine the urgency level of the document."""
+async def analyze_document(state: DocumentState) -> dict:
+    """Classify, extract key information and rate urgency in one LLM call."""
     document = state["document"]
-    extracted_info = state.get("extracted_info", {})
 
     messages = [
-        SystemMessage(content="""Determine the urgency level. Return ONLY one word:
-        - high (immediate action needed, critical issues, deadlines today)
-        - medium (action needed soon, important but not critical)
-        - low (informational, no immediate action needed)"""),
-        HumanMessage(content=f"Document:\n{document}\n\nExtracted info:\n{extracted_info}")
+        ANALYZE_SYSTEM,
+        HumanMessage(content=f"Document:\n{document}")
     ]
 
-    response = llm.invoke(messages)
-    urgency = response.content.strip().lower()
-
-    # Validate
-    if urgency not in ["high", "medium", "low"]:
-        urgency = "medium"
+    analysis = await analyzer.ainvoke(messages)
 
-    print(f"[urgency] Urgency level: {urgency}")
-    return {"urgency": urgency}
+    print(f"[analyze] Document type: {analysis.doc_type}, urgency: {analysis.urgency}")
+    return {
+        "doc_type": analysis.doc_type,
+        "extracted_info": analysis.extracted_info,
+        "urgency": analysis.urgency
+    }
 
 
-def summarize_document(state: DocumentState) -> dict:
+async def summarize_document(state: DocumentState) -> dict:
     """Create a brief summary of the document."""
     document = state["document"]
     doc_type = state["doc_type"]
     extracted_info = state.get("extracted_info", {})
 
     messages = [
-        SystemMessage(content="""Create a brief 2-3 sentence summary of the document.
-        Focus on the most important information."""),
+        SUMMARIZE_SYSTEM,
         HumanMessage(content=f"Document type: {doc_type}\nExtracted info: {extracted_info}\n\nDocument:\n{document}")
     ]
 
-    response = llm.invoke(messages)
+    response = await llm.ainvoke(messages)
 
     print(f"[summarize] Created summary")
     return {"summary": response.content}
 
 
-def handle_urgent(state: DocumentState) -> dict:
+async def _stream_reply(messages) -> str:
+    """Stream a reply token by token and return the full text.
+
+    Streaming lets callers of app.astream_events see the first tokens
+    while the rest of the response is still being generated.
+    """
+    chunks = [chunk.content async for chunk in llm.astream(messages)]
+    return "".join(chunks)
+
+
+async def handle_urgent(state: DocumentState) -> dict:
     """Handle urgent documents with immediate response."""
     summary = state["summary"]
     extracted_info = state.get("extracted_info", {})
 
     messages = [
-        SystemMessage(content="""This is an URGENT document. Create a brief response that:
-        1. Acknowledges the urgency
-        2. Outlines immediate next steps
-        3. Identifies who needs to be notified"""),
+        URGENT_SYSTEM,
         HumanMessage(content=f"Summary: {summary}\nExtracted info: {extracted_info}")
     ]
 
-    response = llm.invoke(messages)
+    reply = await _stream_reply(messages)
 
     print(f"[handle_urgent] Created urgent response")
-    return {"response": f"[URGENT HANDLING]\n{response.content}"}
+    return {"response": f"[URGENT HANDLING]\n{reply}"}
 
 
-def handle_normal(state: DocumentState) -> dict:
+async def handle_normal(state: DocumentState) -> dict:
     """Handle normal documents with standard response."""
     summary = state["summary"]
     doc_type = state["doc_type"]
 
     messages = [
-        SystemMessage(content="""Create a brief response that:
-        1. Acknowledges receipt
-        2. Notes key points
-        3. Suggests next steps if applicable"""),
+        NORMAL_SYSTEM,
         HumanMessage(content=f"Document type: {doc_type}\nSummary: {summary}")
     ]
 
-    response = llm.invoke(messages)
+    reply = await _stream_reply(messages)
 
     print(f"[handle_normal] Created standard response")
-    return {"response": f"[STANDARD HANDLING]\n{response.content}"}
+    return {"response": f"[STANDARD HANDLING]\n{reply}"}
 
 
 # ============ ROUTING FUNCTION ============
@@ -185,18 +191,14 @@ def build_document_workflow():
     graph = StateGraph(DocumentState)
 
     # Add nodes
-    graph.add_node("classify", classify_document)
-    graph.add_node("extract", extract_info)
-    graph.add_node("urgency", determine_urgency)
+    graph.add_node("analyze", analyze_document)
     graph.add_node("summarize", summarize_document)
     graph.add_node("urgent", handle_urgent)
     graph.add_node("normal", handle_normal)
 
     # Add edges
-    graph.add_edge(START, "classify")
-    graph.add_edge("classify", "extract")
-    graph.add_edge("extract", "urgency")
-    graph.add_edge("urgency", "summarize")
+    graph.add_edge(START, "analyze")
+    graph.add_edge("analyze", "summarize")
 
     # Conditional routing after summarize
     graph.add_conditional_edges(
@@ -212,23 +214,59 @@ def build_document_workflow():
     graph.add_edge("urgent", END)
     graph.add_edge("normal", END)
 
-    # Compile with memory for checkpointing
-    memory = MemorySaver()
-    app = graph.compile(checkpointer=memory)
+    # Compile with the shared memory for checkpointing
+    return graph.compile(checkpointer=memory)
+
 
-    return app
+# Compile once at import; every call below reuses the same app
+app = build_document_workflow()
 
 
-def process_document(document: str, thread_id: str = "default"):
-    """Process a document through the workflow."""
-    app = build_document_workflow()
-    config = {"configurable": {"thread_id": thread_id}}
+def _thread_config(thread_id: str | None) -> dict:
+    """Run config for a thread; a fresh thread per run unless one is given.
 
-    result = app.invoke({"document": document}, config)
+    The checkpointer is shared, so reusing a fixed id would pile every run's
+    checkpoints onto one thread and merge earlier state into later runs.
+    """
+    return {"configurable": {"thread_id": thread_id or uuid4().hex}}
+
+
+async def process_document(document: str, thread_id: str | None = None):
+    """Process a document through the workflow.
+
+    Pass ``thread_id`` to resume or inspect a specific thread; by default
+    each call runs on a new one.
+    """
+    config = _thread_config(thread_id)
+
+    result = await app.ainvoke({"document": document}, config)
 
     return result
 
 
+async def stream_response(document: str, thread_id: str | None = None):
+    """Process a document, yielding the response text as it is generated."""
+    config = _thread_config(thread_id)
+
+    async for event in app.astream_events({"document": document}, config, version="v2"):
+        if (event["event"] == "on_chat_model_stream"
+                and event["metadata"].get("langgraph_node") in ("urgent", "normal")):
+            yield event["data"]["chunk"].content
+
+
+async def process_documents(documents: list[str]) -> list[dict]:
+    """Process several documents concurrently with a single batch call."""
+    inputs = [{"document": doc} for doc in documents]
+    # Prefix with a per-call id so a later batch never lands on these threads
+    run_id = uuid4().hex[:8]
+    configs = [
+        _thread_config(f"{run_id}-doc-{i}")
+        for i in range(1, len(documents) + 1)
+    ]
+
+    return await app.abatch(inputs, configs)
+
+
 def main():
     """Demo the document processing workflow."""
     test_documents = [
@@ -274,14 +312,15 @@ Thanks,
 Sarah"""
     ]
 
-    for i, doc in enumerate(test_documents, 1):
+    # All documents go through the graph at once; node logs will interleave
+    results = asyncio.run(process_documents(test_documents))
+
+    for i, (doc, result) in enumerate(zip(test_documents, results), 1):
         print("\n" + "=" * 70)
         print(f"DOCUMENT {i}")
         print("=" * 70)
         print(doc[:100] + "..." if len(doc) > 100 else doc)
 
-        result = process_document(doc, f"doc-{i}")
-
         print("\n" + "-" * 40)
         print("RESULT:")
         print(f"Type: {result['doc_type']}")
@@ -17,23 +17,36 @@ Requirements:
     - langchain, langgraph, langchain-openai packages
 """
 
+import asyncio
+import json
 import os
+import re
 import sys
 from typing import TypedDict, Literal, Annotated
 from datetime import datetime
+from functools import lru_cache
 
 # Add utils to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import tiktoken
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
+from llm_cache import cached_node, content_key
+from shared_llm import llm
 
 # Load environment
 load_dotenv()
 
+# Shared checkpointer; each document gets its own thread_id
+checkpointer = MemorySaver()
+
+# Part of every cache key; bump whenever a prompt changes
+PROMPT_VERSION = "4"
+
 
 # =============================================================================
 # State Definition
@@ -42,8 +55,9 @@ load_dotenv()
 class ComplianceState(TypedDict):
     """State for the compliance review workflow."""
     
-    # Input
-    document_text: str
+    # Input - only the part of the document the prompts use, so state
+    # (and checkpoints) never carry the full text
+    document_excerpt: str
     document_id: str
     
     # Classification
@@ -71,146 +85,229 @@ class ComplianceState(TypedDict):
 
 
 # =============================================================================
-# Node Functions
+# Structured Output Schemas
 # =============================================================================
 
-def classify_document(state: ComplianceState) -> dict:
-    """Classify the document type."""
-    
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# extra="forbid" and no defaults keep these valid for OpenAI's strict
+# json_schema mode, where the server only ever returns matching JSON.
+
+class EntitiesSchema(BaseModel):
+    """Entities that need the model; the rest are pattern-matched."""
+    model_config = ConfigDict(extra="forbid")
     
-    prompt = f"""Classify this document into exactly one of these categories:
-- policy: Internal company policies, procedures, guidelines
-- contract: Legal agreements, terms of service, SLAs
-- disclosure: Financial disclosures, risk disclosures, regulatory filings
-- marketing: Marketing materials, advertisements, promotional content
-- other: Documents that don't fit the above categories
+    parties: list[str] = Field(description="Named parties/organizations")
+    key_terms: list[str] = Field(description="Important compliance terms")
 
-Document text:
-{state['document_text'][:3000]}
 
-Respond with ONLY the category name (lowercase), nothing else."""
+class RiskFlagSchema(BaseModel):
+    """A single compliance risk."""
+    model_config = ConfigDict(extra="forbid")
+    
+    category: str = Field(description="Category of risk")
+    description: str = Field(description="Specific description of the risk")
+    severity: Literal["low", "medium", "high", "critical"]
+    location: str = Field(description="Where in the document this appears")
+
 
-    response = llm.invoke([HumanMessage(content=prompt)])
-    doc_type = response.content.strip().lower()
+class AnalysisSchema(BaseModel):
+    """Combined classification, entity extraction and risk analysis."""
+    model_config = ConfigDict(extra="forbid")
     
-    # Validate response
-    valid_types = ["policy", "contract", "disclosure", "marketing", "other"]
-    if doc_type not in valid_types:
-        doc_type = "other"
+    document_type: Literal["policy", "contract", "disclosure", "marketing", "other"]
+    entities: EntitiesSchema
+    risk_flags: list[RiskFlagSchema]
+    risk_score: int = Field(description="Overall risk score from 0 to 100")
+    risk_level: Literal["low", "medium", "high", "critical"]
+
+
+class SummarySchema(BaseModel):
+    """Final summary and recommendations."""
+    model_config = ConfigDict(extra="forbid")
     
+    summary: str = Field(description="2-3 sentence executive summary")
+    recommendations: list[str] = Field(description="3-5 specific recommendations")
+
+
+def response_format_for(schema: type[BaseModel]) -> dict:
+    """Return the strict json_schema response_format for a schema."""
     return {
-        "document_type": doc_type,
-        "processing_status": "classified"
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "strict": True,
+            "schema": schema.model_json_schema()
+        }
     }
 
 
-def extract_entities(state: ComplianceState) -> dict:
-    """Extract compliance-relevant entities from the document."""
-    
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    
-    prompt = f"""Extract compliance-relevant entities from this {state['document_type']} document.
+analysis_llm = llm.with_structured_output(AnalysisSchema, method="json_schema", strict=True)
+summary_llm = llm.with_structured_output(SummarySchema, method="json_schema", strict=True)
 
-Document text:
-{state['document_text'][:4000]}
 
-Return a JSON object with these fields (use empty arrays/strings if not found):
-{{
-    "parties": ["list of named parties/organizations"],
-    "dates": ["list of important dates mentioned"],
-    "monetary_amounts": ["list of monetary values mentioned"],
-    "regulations_referenced": ["list of laws/regulations mentioned (e.g., GDPR, SOX, FINRA)"],
-    "key_terms": ["list of important compliance terms"],
-    "contact_information": ["any email/phone/address mentioned"]
-}}
+# =============================================================================
+# Prompt Layout
+# =============================================================================
 
-Return ONLY the JSON object, no other text."""
+# Every LLM node sends the same two leading messages - this system message and
+# the document text - and puts its task-specific instructions in a message
+# after them. Keeping that prefix byte-identical across nodes lets provider
+# prompt caching reuse it for every call on the same document.
+_STATIC_SYS = SystemMessage(content="""You are a compliance analyst reviewing documents for a \
+financial services firm. You will be given a document and then a specific \
+review task. Follow the task instructions exactly and respond only in the \
+requested format.""")
 
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    # Parse response (with fallback)
-    import json
-    try:
-        entities = json.loads(response.content)
-    except json.JSONDecodeError:
-        entities = {
-            "parties": [],
-            "dates": [],
-            "monetary_amounts": [],
-            "regulations_referenced": [],
-            "key_terms": [],
-            "contact_information": [],
-            "parse_error": "Could not parse entity extraction response"
-        }
-    
+# Documents are truncated by tokens rather than characters, so every prompt
+# gets the same budget regardless of how densely the text tokenizes
+DOCUMENT_TOKENS = 1200
+ENC = tiktoken.encoding_for_model(llm.model_name)
+
+
+def token_slice(text: str, n: int) -> str:
+    """Return the first ``n`` tokens of ``text``."""
+    ids = ENC.encode(text)
+    if len(ids) <= n:
+        return text
+    return ENC.decode(ids[:n])
+
+
+@lru_cache(maxsize=256)
+def _document_message(excerpt: str) -> HumanMessage:
+    """Build the document message once per excerpt; every node reuses it."""
+    return HumanMessage(content=f"Document text:\n{excerpt}")
+
+
+def _compliance_messages(state: ComplianceState, task: HumanMessage) -> list:
+    """Build the message list for a node: shared prefix, then the task."""
+    return [_STATIC_SYS, _document_message(state["document_excerpt"]), task]
+
+
+def _stable_json(value) -> str:
+    """Serialize derived state deterministically for inclusion in prompts."""
+    return json.dumps(value, sort_keys=True)
+
+
+# =============================================================================
+# Pattern-Matched Entities
+# =============================================================================
+
+# Dates, amounts, contacts and regulation references follow fixed formats, so
+# they are matched with regexes over the full document rather than asked of
+# the model, which only sees the truncated excerpt
+_MONTH = (r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?"
+          r"|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)")
+RE_DATE = re.compile(rf"\b{_MONTH}\.?\s+\d{{1,2}},?\s+\d{{4}}\b|\b\d{{4}}-\d{{2}}-\d{{2}}\b")
+RE_MONEY = re.compile(r"\$\s?\d[\d,]*(?:\.\d+)?(?:\s?(?:million|billion|[MBK])\b)?|\b\d+(?:\.\d+)?\s?%")
+RE_PHONE = re.compile(r"\(\d{3}\)\s?\d{3}-\d{4}|\b\d{3}[-.]\d{3}[-.]\d{4}\b")
+RE_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+RE_REGULATION = re.compile(
+    r"\b(?:(?:SEC|FINRA) Rule \d[\w\-()]*\w"
+    r"|Investment (?:Advisers|Company) Act(?: of \d{4})?"
+    r"|GDPR|SOX|Sarbanes-Oxley|FINRA|HIPAA|CCPA|GLBA|Dodd-Frank|MiFID II|AML|KYC)\b"
+)
+
+
+def _unique(matches: list[str]) -> list[str]:
+    """Drop repeated matches, keeping first-seen order."""
+    return list(dict.fromkeys(match.strip() for match in matches))
+
+
+def extract_pattern_entities(text: str) -> dict:
+    """Extract the entities that have a fixed textual format."""
     return {
-        "entities": entities,
-        "processing_status": "entities_extracted"
+        "dates": _unique(RE_DATE.findall(text)),
+        "monetary_amounts": _unique(RE_MONEY.findall(text)),
+        "regulations_referenced": _unique(RE_REGULATION.findall(text)),
+        "contact_information": _unique(RE_EMAIL.findall(text) + RE_PHONE.findall(text)),
     }
 
 
-def analyze_risks(state: ComplianceState) -> dict:
-    """Analyze the document for compliance risks."""
-    
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    
-    # Risk categories by document type
-    risk_focus = {
-        "policy": "policy gaps, unclear procedures, missing approvals",
-        "contract": "unfavorable terms, liability exposure, missing clauses",
-        "disclosure": "incomplete information, misleading statements, omissions",
-        "marketing": "false claims, missing disclaimers, regulatory violations",
-        "other": "general compliance concerns"
-    }
+def merge_entities(state: ComplianceState, update: dict) -> dict:
+    """Add the pattern-matched entities already in state to an analysis update."""
+    return {**update, "entities": {**update["entities"], **state.get("entities", {})}}
+
+
+# =============================================================================
+# Node Functions
+# =============================================================================
+
+# Risk categories by document type
+RISK_FOCUS = {
+    "policy": "policy gaps, unclear procedures, missing approvals",
+    "contract": "unfavorable terms, liability exposure, missing clauses",
+    "disclosure": "incomplete information, misleading statements, omissions",
+    "marketing": "false claims, missing disclaimers, regulatory violations",
+    "other": "general compliance concerns"
+}
+
+
+# The analysis task is the same for every document, so it is built once
+_RISK_FOCUS_LINES = "\n".join(f"- {doc_type}: {areas}" for doc_type, areas in RISK_FOCUS.items())
+
+ANALYZE_TASK = f"""Review this document in three steps and return all results together.
+
+1. Classify the document into exactly one of these categories:
+- policy: Internal company policies, procedures, guidelines
+- contract: Legal agreements, terms of service, SLAs
+- disclosure: Financial disclosures, risk disclosures, regulatory filings
+- marketing: Marketing materials, advertisements, promotional content
+- other: Documents that don't fit the above categories
+
+2. Extract the named parties and key compliance terms (use empty arrays
+if not found).
+
+3. Analyze the document for compliance risks. Focus particularly on the
+areas that matter for its category:
+{_RISK_FOCUS_LINES}"""
+_ANALYZE_TASK_MESSAGE = HumanMessage(content=ANALYZE_TASK)
+
+SUMMARY_TASK_PREFIX = "Generate a compliance analysis summary for this document.\n\n"
+SUMMARY_TASK_SUFFIX = """
+
+Provide:
+1. A 2-3 sentence executive summary
+2. 3-5 specific recommendations"""
+
+
+def analyze_messages(state: ComplianceState) -> list:
+    """Build the combined classification, extraction and risk prompt."""
     
-    focus = risk_focus.get(state['document_type'], risk_focus['other'])
-    
-    prompt = f"""Analyze this {state['document_type']} document for compliance risks.
-Focus particularly on: {focus}
-
-Document text:
-{state['document_text'][:4000]}
-
-Entities found:
-{state['entities']}
-
-Return a JSON object:
-{{
-    "risk_flags": [
-        {{
-            "category": "category of risk",
-            "description": "specific description of the risk",
-            "severity": "low|medium|high|critical",
-            "location": "where in document this appears"
-        }}
-    ],
-    "risk_score": 0-100 (overall risk score),
-    "risk_level": "low|medium|high|critical"
-}}
-
-Return ONLY the JSON object."""
-
-    response = llm.invoke([HumanMessage(content=prompt)])
-    
-    import json
-    try:
-        risk_analysis = json.loads(response.content)
-    except json.JSONDecodeError:
-        risk_analysis = {
-            "risk_flags": [{"category": "parse_error", "description": "Could not analyze", "severity": "medium"}],
-            "risk_score": 50,
-            "risk_level": "medium"
-        }
+    return _compliance_messages(state, _ANALYZE_TASK_MESSAGE)
+
+
+def analysis_update(analysis: AnalysisSchema) -> dict:
+    """Turn the combined analysis into a state update."""
     
     return {
-        "risk_flags": risk_analysis.get("risk_flags", []),
-        "risk_score": risk_analysis.get("risk_score", 50),
-        "risk_level": risk_analysis.get("risk_level", "medium"),
-        "processing_status": "risks_analyzed"
+        "document_type": analysis.document_type,
+        "entities": analysis.entities.model_dump(),
+        "risk_flags": [flag.model_dump() for flag in analysis.risk_flags],
+        "risk_score": analysis.risk_score,
+        "risk_level": analysis.risk_level,
+        "processing_status": "analyzed"
     }
 
 
+@cached_node(
+    lambda state: content_key(state["document_excerpt"], "analyze_all"),
+    model=llm.model_name, version=PROMPT_VERSION,
+)
+async def _analyze(state: ComplianceState) -> dict:
+    analysis = await analysis_llm.ainvoke(analyze_messages(state))
+    return analysis_update(analysis)
+
+
+async def analyze_all(state: ComplianceState) -> dict:
+    """Classify the document, extract entities and analyze risks in one call."""
+    
+    # Only the model's output is cached; pattern entities come from state
+    return merge_entities(state, await _analyze(state))
+
+
+# Flag severities that trigger human review
+_HIGH_SEV = frozenset(("critical", "high"))
+
+
 def determine_routing(state: ComplianceState) -> dict:
     """Determine if human review is required based on risk analysis."""
     
@@ -223,13 +320,12 @@ def determine_routing(state: ComplianceState) -> dict:
         review_reason = f"High risk score: {state['risk_score']}"
     
     # Critical or high severity flags trigger review
-    critical_flags = [f for f in state.get("risk_flags", []) 
-                     if f.get("severity") in ["critical", "high"]]
-    if critical_flags:
+    n_critical = sum(1 for f in state.get("risk_flags", ()) if f.get("severity") in _HIGH_SEV)
+    if n_critical:
         requires_review = True
         if review_reason:
             review_reason += "; "
-        review_reason += f"{len(critical_flags)} high/critical risk flags"
+        review_reason += f"{n_critical} high/critical risk flags"
     
     # Certain document types always need review
     if state.get("document_type") in ["disclosure", "contract"]:
@@ -246,55 +342,73 @@ def determine_routing(state: ComplianceState) -> dict:
     }
 
 
-def generate_summary(state: ComplianceState) -> dict:
-    """Generate final analysis summary and recommendations."""
+def summary_messages(state: ComplianceState) -> list:
+    """Build the prompt for the final summary."""
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-    
-    prompt = f"""Generate a compliance analysis summary for this document.
-
-Document Type: {state['document_type']}
+    details = f"""Document Type: {state['document_type']}
 Risk Level: {state['risk_level']} (score: {state['risk_score']})
 Risk Flags: {len(state.get('risk_flags', []))} issues identified
 Requires Human Review: {state['requires_human_review']}
 
 Entities Found:
-{state.get('entities', {})}
+{_stable_json(state.get('entities', {}))}
 
 Risk Flags:
-{state.get('risk_flags', [])}
+{_stable_json(state.get('risk_flags', []))}"""
 
-Provide:
-1. A 2-3 sentence executive summary
-2. 3-5 specific recommendations
+    task = HumanMessage(content=SUMMARY_TASK_PREFIX + details + SUMMARY_TASK_SUFFIX)
+    return _compliance_messages(state, task)
 
-Return as JSON:
-{{
-    "summary": "executive summary text",
-    "recommendations": ["rec1", "rec2", "rec3"]
-}}
 
-Return ONLY the JSON object."""
-
-    response = llm.invoke([HumanMessage(content=prompt)])
+def summary_update(output: SummarySchema) -> dict:
+    """Turn the summary into a state update."""
     
-    import json
-    try:
-        output = json.loads(response.content)
-    except json.JSONDecodeError:
-        output = {
-            "summary": f"Analysis complete for {state['document_type']} document. Risk level: {state['risk_level']}.",
-            "recommendations": ["Review document manually", "Consult compliance team"]
-        }
+    return {
+        "analysis_summary": output.summary,
+        "recommendations": output.recommendations,
+        "processing_status": "complete",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@cached_node(
+    lambda state: content_key(
+        *(message.content for message in summary_messages(state)), "generate_summary"
+    ),
+    model=llm.model_name, version=PROMPT_VERSION,
+)
+async def _summarize(state: ComplianceState) -> dict:
+    output = await summary_llm.ainvoke(summary_messages(state))
+    return summary_update(output)
+
+
+def template_summary(state: ComplianceState) -> dict | None:
+    """Return a fixed summary for clean low-risk documents, else None."""
     
+    if (state.get("risk_level") != "low" or state.get("risk_flags")
+            or state.get("requires_human_review")):
+        return None
     return {
-        "analysis_summary": output.get("summary", ""),
-        "recommendations": output.get("recommendations", []),
+        "analysis_summary": f"{state['document_type'].title()} document reviewed; "
+                            "no material compliance issues detected.",
+        "recommendations": ["File for periodic re-review", "No action required"],
         "processing_status": "complete",
         "timestamp": datetime.now().isoformat()
     }
 
 
+async def generate_summary(state: ComplianceState) -> dict:
+    """Generate final analysis summary and recommendations."""
+    
+    # Clean low-risk documents need no LLM call
+    template = template_summary(state)
+    if template is not None:
+        return template
+    
+    # A cached summary keeps its original timestamp, so always refresh it
+    return {**await _summarize(state), "timestamp": datetime.now().isoformat()}
+
+
 def human_review_checkpoint(state: ComplianceState) -> dict:
     """Checkpoint for human review - execution pauses here."""
     # This node exists as a pause point for human-in-the-loop
@@ -325,25 +439,29 @@ def route_after_routing(state: ComplianceState) -> Literal["human_review", "gene
 # Build the Graph
 # =============================================================================
 
-def build_compliance_graph():
-    """Build and compile the compliance review graph."""
+@lru_cache(maxsize=2)
+def build_compliance_graph(hitl: bool = False):
+    """Build and compile the compliance review graph.
+
+    The graph has no per-document state, so each variant is compiled once
+    and reused. Only the human-in-the-loop variant (``hitl=True``) gets a
+    checkpointer and pauses before review; the default one skips
+    checkpointing entirely, since saving state after every node is pure
+    overhead for documents that never pause.
+    """
     
     # Create graph with state schema
     graph = StateGraph(ComplianceState)
     
     # Add nodes
-    graph.add_node("classify", classify_document)
-    graph.add_node("extract_entities", extract_entities)
-    graph.add_node("analyze_risks", analyze_risks)
+    graph.add_node("analyze_all", analyze_all)
     graph.add_node("determine_routing", determine_routing)
     graph.add_node("human_review", human_review_checkpoint)
     graph.add_node("generate_summary", generate_summary)
     
     # Add edges
-    graph.add_edge(START, "classify")
-    graph.add_edge("classify", "extract_entities")
-    graph.add_edge("extract_entities", "analyze_risks")
-    graph.add_edge("analyze_risks", "determine_routing")
+    graph.add_edge(START, "analyze_all")
+    graph.add_edge("analyze_all", "determine_routing")
     
     # Conditional routing after determining if human review needed
     graph.add_conditional_edges(
@@ -361,40 +479,31 @@ def build_compliance_graph():
     # End after summary
     graph.add_edge("generate_summary", END)
     
-    # Compile with checkpointer for human-in-the-loop
-    checkpointer = MemorySaver()
+    if not hitl:
+        return graph.compile()
     
+    # Compile with checkpointer for human-in-the-loop
     return graph.compile(
         checkpointer=checkpointer,
         interrupt_before=["human_review"]  # Pause before human review
     )
 
 
+COMPLIANCE_APP = build_compliance_graph()
+HITL_APP = build_compliance_graph(hitl=True)
+
+
 # =============================================================================
 # Main Execution
 # =============================================================================
 
-def analyze_document(document_text: str, document_id: str = "doc_001") -> dict:
-    """
-    Analyze a document for compliance issues.
-    
-    Args:
-        document_text: The document content to analyze
-        document_id: Unique identifier for the document
-        
-    Returns:
-        Final state with analysis results
-    """
-    
-    # Build the graph
-    app = build_compliance_graph()
-    
-    # Initial state
-    initial_state = {
-        "document_text": document_text,
+def initial_state(document_text: str, document_id: str) -> ComplianceState:
+    """Return the starting state for a document."""
+    return {
+        "document_excerpt": token_slice(document_text, DOCUMENT_TOKENS),
         "document_id": document_id,
         "document_type": "",
-        "entities": {},
+        "entities": extract_pattern_entities(document_text),
         "risk_flags": [],
         "risk_score": 0,
         "risk_level": "",
@@ -405,43 +514,115 @@ def analyze_document(document_text: str, document_id: str = "doc_001") -> dict:
         "timestamp": "",
         "processing_status": "started"
     }
+
+
+async def analyze_document(document_text: str, document_id: str = "doc_001") -> dict:
+    """
+    Analyze a document for compliance issues without any progress output.
     
-    # Thread config for checkpointing
-    config = {"configurable": {"thread_id": document_id}}
+    This is the fast path for bulk use: a single ainvoke call, no per-node
+    events and no checkpointing. Documents that need human review are
+    flagged in the result (``requires_human_review``) for queuing elsewhere.
+    
+    Args:
+        document_text: The document content to analyze
+        document_id: Unique identifier for the document
+        
+    Returns:
+        Final state with analysis results
+    """
+    
+    return await COMPLIANCE_APP.ainvoke(initial_state(document_text, document_id))
+
+
+async def analyze_document_verbose(document_text: str, document_id: str = "doc_001",
+                                   hitl: bool = False) -> dict:
+    """
+    Analyze a document for compliance issues, printing each step.
+    
+    Args:
+        document_text: The document content to analyze
+        document_id: Unique identifier for the document
+        hitl: Pause for human review when it is required. Without it the
+            graph runs straight through and documents needing review are
+            only flagged, so they can be queued for a reviewer afterwards.
+        
+    Returns:
+        Final state with analysis results
+    """
     
     # Run the graph
     print(f"\n{'='*60}")
     print(f"Analyzing document: {document_id}")
     print(f"{'='*60}\n")
     
-    # Stream through nodes
-    for event in app.stream(initial_state, config):
+    if not hitl:
+        # No checkpointer here, so the final state is built from the updates
+        final_state = initial_state(document_text, document_id)
+        async for event in COMPLIANCE_APP.astream(final_state.copy()):
+            for node_name, node_output in event.items():
+                print(f"✓ {node_name}: {node_output.get('processing_status', 'processing')}")
+                final_state.update(node_output)
+        
+        if final_state["requires_human_review"]:
+            print(f"\n⚠ Flagged for human review: {final_state['human_review_reason']}")
+        return final_state
+    
+    app = HITL_APP
+    
+    # Thread config for checkpointing
+    config = {"configurable": {"thread_id": document_id}}
+    
+    # Stream through nodes until the graph finishes or pauses before review
+    async for event in app.astream(initial_state(document_text, document_id), config):
         for node_name, node_output in event.items():
-            status = node_output.get("processing_status", "processing")
-            print(f"✓ {node_name}: {status}")
-            
-            # If paused for human review, handle it
-            if status == "awaiting_human_review":
-                print("\n" + "!"*60)
-                print("PAUSED: Document requires human review")
-                print(f"Reason: {app.get_state(config).values.get('human_review_reason', 'Unknown')}")
-                print("!"*60 + "\n")
-                
-                # In a real system, this would wait for approval
-                # For demo, we auto-approve
-                print("(Auto-approving for demo purposes...)\n")
-                
-                # Resume execution
-                for resume_event in app.stream(None, config):
-                    for name, output in resume_event.items():
-                        print(f"✓ {name}: {output.get('processing_status', 'processing')}")
+            if node_name != "__interrupt__":
+                print(f"✓ {node_name}: {node_output.get('processing_status', 'processing')}")
+    
+    # If paused for human review, handle it
+    review_state = await app.aget_state(config)
+    if review_state.next:
+        print("\n" + "!"*60)
+        print("PAUSED: Document requires human review")
+        print(f"Reason: {review_state.values.get('human_review_reason', 'Unknown')}")
+        print("!"*60 + "\n")
+        
+        # In a real system, this would wait for approval
+        # For demo, we auto-approve
+        print("(Auto-approving for demo purposes...)\n")
+        
+        # Resume execution
+        async for resume_event in app.astream(None, config):
+            for name, output in resume_event.items():
+                print(f"✓ {name}: {output.get('processing_status', 'processing')}")
     
     # Get final state
-    final_state = app.get_state(config).values
+    final_state = (await app.aget_state(config)).values
     
     return final_state
 
 
+async def analyze_documents(docs: list[tuple[str, str]], concurrency: int = 20) -> list[dict]:
+    """
+    Analyze many documents concurrently.
+    
+    Args:
+        docs: (document_text, document_id) pairs; ids must be unique
+        concurrency: Maximum number of documents in flight at once
+        
+    Returns:
+        Final states, in the same order as ``docs``
+    """
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def _run(document_text: str, document_id: str) -> dict:
+        async with semaphore:
+            return await analyze_document(document_text, document_id)
+    
+    return await asyncio.gather(*[_run(text, doc_id) for text, doc_id in docs])
+
+
 def print_results(state: dict):
     """Pretty print the analysis results."""
     
@@ -463,7 +644,7 @@ def print_results(state: dict):
     print(f"\n--- Entities Extracted ---")
     entities = state.get('entities', {})
     for key, values in entities.items():
-        if values and key != "parse_error":
+        if values:
             print(f"  {key}: {', '.join(values) if isinstance(values, list) else values}")
     
     print(f"\n--- Risk Flags ({len(state.get('risk_flags', []))}) ---")
@@ -529,7 +710,7 @@ if __name__ == "__main__":
     """
     
     # Run analysis
-    result = analyze_document(sample_document, "DEMO_001")
+    result = asyncio.run(analyze_document_verbose(sample_document, "DEMO_001", hitl=True))
     
     # Print results
     print_results(result)
@@ -0,0 +1,109 @@
+"""
+Content-addressed cache for LLM-backed graph nodes.
+
+Node results are stored under a hash of everything that determines them:
+the prompt inputs, the node name, the model and a prompt version. Re-running
+an unchanged document then skips the API call entirely, which is common in
+compliance pipelines where the same documents are reviewed again and again.
+
+The model and prompt version are required arguments of ``cached_node`` and
+are mixed into every key, so switching models or bumping the caller's prompt
+version stops old entries from being hit; they then age out after
+``expire`` seconds.
+
+Uses ``diskcache`` when it is installed and a small JSON-file store in
+``Solutions/.cache/llm`` otherwise. Nothing is written to disk until the
+first result is stored.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from diskcache import Cache
+    _DISKCACHE_AVAILABLE = True
+except ImportError:  # pragma: no cover - dependency optional
+    _DISKCACHE_AVAILABLE = False
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "llm"
+DEFAULT_EXPIRE = 30 * 86400  # seconds
+
+
+class _FileCache:
+    """Minimal diskcache stand-in: one JSON file per key."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def get(self, key: str, default=None):
+        path = self.directory / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return default
+        if entry["expires"] is not None and entry["expires"] < time.time():
+            path.unlink(missing_ok=True)
+            return default
+        return entry["value"]
+
+    def set(self, key: str, value, expire: float | None = None) -> None:
+        expires = time.time() + expire if expire is not None else None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename it into place, so concurrent writers
+        # or a crash mid-write never leave a truncated entry behind
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({"expires": expires, "value": value}, f)
+            os.replace(tmp, self.directory / f"{key}.json")
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+@functools.lru_cache(maxsize=1)
+def get_cache():
+    """Return the process-wide cache, opening it on first use."""
+    return Cache(str(CACHE_DIR)) if _DISKCACHE_AVAILABLE else _FileCache(CACHE_DIR)
+
+
+def content_key(*parts: str) -> str:
+    """Hash the given strings into a cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x1f")  # separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+def cached_node(key_fn, *, model: str, version: str, expire: float = DEFAULT_EXPIRE):
+    """
+    Cache an async LangGraph node's output.
+
+    Cache reads and writes are file (or SQLite) I/O, so they run in a worker
+    thread to keep the event loop free for concurrent documents.
+
+    Args:
+        key_fn: Maps the node's input state to a cache key (see content_key)
+        model: Model name the node calls; part of every key
+        version: Prompt version of the node; part of every key
+        expire: Seconds before an entry expires
+    """
+    def decorator(node):
+        @functools.wraps(node)
+        async def wrapper(state):
+            key = content_key(key_fn(state), model, version)
+            cache = get_cache()
+            result = await asyncio.to_thread(cache.get, key)
+            if result is None:
+                result = await node(state)
+                await asyncio.to_thread(cache.set, key, result, expire=expire)
+            return result
+        return wrapper
+    return decorator
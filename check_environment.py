@@ -14,32 +14,55 @@ This will check:
 
 import sys
 import os
+from functools import lru_cache, partial
 from importlib import import_module
+from importlib.util import find_spec, module_from_spec, spec_from_file_location
+
+# ANSI colors for output, only when writing to a terminal that wants them
+_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+GREEN = "\033[92m" if _COLOR else ""
+RED = "\033[91m" if _COLOR else ""
+YELLOW = "\033[93m" if _COLOR else ""
+RESET = "\033[0m" if _COLOR else ""
+BOLD = "\033[1m" if _COLOR else ""
+
+# Status symbols and header rule, built once
+_SYMBOLS = {
+    "ok": f"{GREEN}✓{RESET}",
+    "warn": f"{YELLOW}⚠{RESET}",
+    "fail": f"{RED}✗{RESET}",
+}
+_HEADER_BAR = f"{BOLD}{'=' * 50}{RESET}"
+
+
+@lru_cache(maxsize=1)
+def _loaded_env() -> bool:
+    """Load .env once per process; returns whether python-dotenv was available."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False
+    load_dotenv()
+    return True
+
 
-# ANSI colors for output
-GREEN = "\033[92m"
-RED = "\033[91m"
-YELLOW = "\033[93m"
-RESET = "\033[0m"
-BOLD = "\033[1m"
+@lru_cache(maxsize=None)
+def _get_key(name: str) -> str | None:
+    """Return an environment variable, loading .env first."""
+    _loaded_env()
+    return os.environ.get(name)
 
 
 def print_status(message: str, status: str):
     """Print a status message with color."""
-    if status == "ok":
-        symbol = f"{GREEN}✓{RESET}"
-    elif status == "warn":
-        symbol = f"{YELLOW}⚠{RESET}"
-    else:
-        symbol = f"{RED}✗{RESET}"
-    print(f"  {symbol} {message}")
+    print(f"  {_SYMBOLS.get(status, _SYMBOLS['fail'])} {message}")
 
 
 def print_header(title: str):
     """Print a section header."""
-    print(f"\n{BOLD}{'='*50}{RESET}")
+    print(f"\n{_HEADER_BAR}")
     print(f"{BOLD}{title}{RESET}")
-    print(f"{BOLD}{'='*50}{RESET}")
+    print(_HEADER_BAR)
 
 
 def check_python_version():
@@ -99,25 +122,21 @@ def check_packages():
     return all_required_ok
 
 
+def _mask(key: str) -> str:
+    """Mask an API key for display, keeping its first 8 and last 4 characters."""
+    return f"{key[:8]}...{key[-4:]}" if len(key) > 12 else "****"
+
+
 def check_api_keys():
     """Check API keys are configured."""
     print_header("API Keys")
     
-    # Try to load from .env
-    try:
-        from dotenv import load_dotenv
-        load_dotenv()
-    except ImportError:
-        pass
-    
     keys_status = {}
     
     # OpenAI (required)
-    openai_key = os.getenv("OPENAI_API_KEY")
+    openai_key = _get_key("OPENAI_API_KEY")
     if openai_key:
-        # Mask the key for display
-        masked = openai_key[:8] + "..." + openai_key[-4:] if len(openai_key) > 12 else "****"
-        print_status(f"OPENAI_API_KEY: {masked}", "ok")
+        print_status(f"OPENAI_API_KEY: {_mask(openai_key)}", "ok")
         keys_status["openai"] = True
     else:
         print_status("OPENAI_API_KEY: not found", "fail")
@@ -125,10 +144,9 @@ def check_api_keys():
         keys_status["openai"] = False
     
     # Tavily (required for Lab 1 search tools)
-    tavily_key = os.getenv("TAVILY_API_KEY")
+    tavily_key = _get_key("TAVILY_API_KEY")
     if tavily_key:
-        masked = tavily_key[:8] + "..." + tavily_key[-4:] if len(tavily_key) > 12 else "****"
-        print_status(f"TAVILY_API_KEY: {masked}", "ok")
+        print_status(f"TAVILY_API_KEY: {_mask(tavily_key)}", "ok")
         keys_status["tavily"] = True
     else:
         print_status("TAVILY_API_KEY: not found (needed for Lab 1 search tools)", "warn")
@@ -136,48 +154,64 @@ def check_api_keys():
         keys_status["tavily"] = False
     
     # Anthropic (optional)
-    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    anthropic_key = _get_key("ANTHROPIC_API_KEY")
     if anthropic_key:
-        masked = anthropic_key[:8] + "..." + anthropic_key[-4:] if len(anthropic_key) > 12 else "****"
-        print_status(f"ANTHROPIC_API_KEY: {masked}", "ok")
+        print_status(f"ANTHROPIC_API_KEY: {_mask(anthropic_key)}", "ok")
     else:
         print_status("ANTHROPIC_API_KEY: not found (optional)", "warn")
     
     return keys_status.get("openai", False)
 
 
+# Seconds allowed for the connectivity probe
+PROBE_TIMEOUT = 5.0
+PROBE_CONNECT_TIMEOUT = 2.0
+
+# Ways to pull the reply text out of a chat completion, covering both the
+# object responses of openai>=1 and the dict responses of older SDKs
+_RESPONSE_EXTRACTORS = (
+    lambda r: r.choices[0].message.content,
+    lambda r: r["choices"][0]["message"]["content"],
+    lambda r: r.choices[0].text,
+    lambda r: r["choices"][0]["text"],
+    lambda r: r["text"],
+    lambda r: r["content"],
+)
+
+
 def check_llm_connectivity():
     """Test actual LLM connectivity."""
     print_header("LLM Connectivity Test")
     
-    openai_key = os.getenv("OPENAI_API_KEY")
+    openai_key = _get_key("OPENAI_API_KEY")
     if not openai_key:
         print_status("Skipped (no API key)", "warn")
         return False
     
-    # First try the official OpenAI client (most predictable). If it's not
-    # available, fall back to LangChain's ChatOpenAI when present.
+    # Use the official OpenAI client (most predictable). Fall back to
+    # LangChain's ChatOpenAI only when the openai package is not installed;
+    # an API error from the SDK is reported rather than retried through
+    # a second, much heavier import.
     try:
         import openai
-        openai.api_key = openai_key
-
+    except ImportError:
+        return _try_langchain(openai_key)
+    
+    try:
         print("  Testing OpenAI (openai) package connection...")
 
-        # Locate a compatible create() function dynamically to satisfy static
-        # analysers that may not know about newer or older SDK shapes.
-        create_fn = None
-        chat_cls = getattr(openai, "ChatCompletion", None)
-        if chat_cls is not None and hasattr(chat_cls, "create"):
-            create_fn = getattr(chat_cls, "create")
-        else:
-            chat_mod = getattr(openai, "chat", None)
-            if chat_mod is not None:
-                completions = getattr(chat_mod, "completions", None)
-                if completions is not None and hasattr(completions, "create"):
-                    create_fn = getattr(completions, "create")
-
-        if create_fn is None or not callable(create_fn):
-            raise RuntimeError("openai ChatCompletion.create not found")
+        # Bound the probe so a slow network or rate-limited key fails fast
+        # instead of hanging the whole check
+        if hasattr(openai, "OpenAI"):  # openai>=1
+            client = openai.OpenAI(
+                api_key=openai_key,
+                timeout=openai.Timeout(PROBE_TIMEOUT, connect=PROBE_CONNECT_TIMEOUT),
+                max_retries=0,
+            )
+            create_fn = client.chat.completions.create
+        else:  # legacy 0.x SDK
+            openai.api_key = openai_key
+            create_fn = partial(openai.ChatCompletion.create, request_timeout=PROBE_TIMEOUT)
 
         resp = create_fn(
             model="gpt-4o-mini",
@@ -186,40 +220,16 @@ def check_llm_connectivity():
             temperature=0,
         )
 
-        # Extract text from the response safely using explicit type checks
+        # Extract text from the response; the first extractor that fits wins
         text = None
-        # If the response is a dict (common for openai.ChatCompletion.create)
-        if isinstance(resp, dict):
-            choices = resp.get("choices")
-            if isinstance(choices, list) and choices:
-                first = choices[0]
-                if isinstance(first, dict):
-                    msg = first.get("message")
-                    if isinstance(msg, dict):
-                        text = msg.get("content")
-                    else:
-                        text = first.get("text") or first.get("content")
-        else:
-            # Try attribute-style access (some SDK wrappers return objects)
-            choices = getattr(resp, "choices", None)
-            if isinstance(choices, list) and choices:
-                first = choices[0]
-                if isinstance(first, dict):
-                    msg = first.get("message")
-                    if isinstance(msg, dict):
-                        text = msg.get("content")
-                    else:
-                        text = first.get("text") or first.get("content")
-                else:
-                    msg = getattr(first, "message", None)
-                    if msg is not None:
-                        text = getattr(msg, "content", None)
-                    else:
-                        text = getattr(first, "text", None)
-
-        # Fallbacks
-        if not text and isinstance(resp, dict):
-            text = resp.get("text") or resp.get("content")
+        for extract in _RESPONSE_EXTRACTORS:
+            try:
+                text = extract(resp)
+            except (KeyError, AttributeError, IndexError, TypeError):
+                continue
+            if text:
+                break
+
         if not text:
             try:
                 text = str(resp)
@@ -233,125 +243,149 @@ def check_llm_connectivity():
             print_status(f"Unexpected response: {text[:50]}", "warn")
             return True
 
-    except Exception:
-        # openai package not available or failed; try LangChain chat model
-        try:
-            from langchain_openai import ChatOpenAI
-            # langchain message classes live in different modules across
-            # versions; try a couple of common locations
-            HumanMessageClass = None
-            try:
-                from langchain.schema import HumanMessage as HumanMessageClass
-            except Exception:
+    except Exception as e:
+        print_status(f"Connection failed: {str(e)[:200]}", "fail")
+        return False
+
+
+@lru_cache(maxsize=None)
+def _chat_method(model_cls: type) -> str:
+    """Name of the method used to call a LangChain chat model class.
+    
+    Resolved once per class instead of probing methods on every call.
+    """
+    return next(
+        (name for name in ("invoke", "predict_messages") if callable(getattr(model_cls, name, None))),
+        "__call__",
+    )
+
+
+def _try_langchain(openai_key: str) -> bool:
+    """Test connectivity through LangChain's ChatOpenAI."""
+    try:
+        from langchain_openai import ChatOpenAI
+
+        # Pick the message class before importing it, so only one module is loaded
+        HumanMessageClass = None
+        if find_spec("langchain_core") is not None:
+            from langchain_core.messages import HumanMessage as HumanMessageClass
+        elif find_spec("langchain") is not None:
+            from langchain.schema import HumanMessage as HumanMessageClass
+
+        if ChatOpenAI is None:
+            raise ImportError("ChatOpenAI class not available")
+
+        print("  Testing OpenAI connection via LangChain...")
+
+        # ChatOpenAI constructor uses `model_name` in recent versions.
+        llm = ChatOpenAI(
+            model_name="gpt-4o-mini",
+            temperature=0,
+            api_key=openai_key,
+            timeout=PROBE_TIMEOUT,
+            max_retries=0,
+        )
+
+        # Prepare messages depending on available message class
+        if HumanMessageClass is not None:
+            payload = [HumanMessageClass(content="Say 'OK' and nothing else.")]
+        else:
+            payload = [{"role": "user", "content": "Say 'OK' and nothing else."}]
+
+        response = getattr(llm, _chat_method(ChatOpenAI))(payload)
+
+        # Normalize different response shapes into a string
+        text = None
+        if isinstance(response, str):
+            text = response
+        elif hasattr(response, "content"):
+            text = getattr(response, "content")
+        elif isinstance(response, list) and response:
+            first = response[0]
+            if isinstance(first, str):
+                text = first
+            elif isinstance(first, dict):
+                # Try common keys
+                text = first.get("content") or first.get("text")
+            elif hasattr(first, "content"):
+                text = getattr(first, "content")
+        else:
+            # Some response shapes include a `generations` attribute
+            gens = getattr(response, "generations", None)
+            if gens:
                 try:
-                    from langchain_core.messages import HumanMessage as HumanMessageClass
+                    if gens and len(gens) > 0 and len(gens[0]) > 0:
+                        maybe = gens[0][0]
+                        text = getattr(maybe, "text", None) or getattr(maybe, "generation", None)
                 except Exception:
-                    HumanMessageClass = None
-
-            if ChatOpenAI is None:
-                raise ImportError("ChatOpenAI class not available")
-
-            print("  Testing OpenAI connection via LangChain...")
-
-            # ChatOpenAI constructor uses `model_name` in recent versions.
-            llm = ChatOpenAI(model_name="gpt-4o-mini", temperature=0)
-
-            # Build message payload and invoke the model safely.
-            # Try available call methods in order and verify callability.
-            def _call_llm_safe(model_obj, messages):
-                last_exc = None
-                # Try preferred high-level methods first
-                for method_name in ("predict_messages", "invoke", "__call__"):
-                    if method_name == "__call__":
-                        if callable(model_obj):
-                            try:
-                                return model_obj(messages)
-                            except Exception as e:
-                                last_exc = e
-                                continue
-                        continue
-
-                    fn = getattr(model_obj, method_name, None)
-                    if fn is not None and callable(fn):
-                        try:
-                            return fn(messages)
-                        except Exception as e:
-                            last_exc = e
-                            continue
-
-                # If we reach here, nothing worked
-                if last_exc:
-                    raise last_exc
-                raise RuntimeError("No callable method found on the LangChain model object")
-
-            # Prepare messages depending on available message class
-            if HumanMessageClass is not None:
-                payload = [HumanMessageClass(content="Say 'OK' and nothing else.")]
-            else:
-                payload = [{"role": "user", "content": "Say 'OK' and nothing else."}]
+                    text = str(response)
 
-            try:
-                response = _call_llm_safe(llm, payload)
-            except Exception:
-                # Re-raise with context for easier debugging
-                raise
-
-            # Normalize different response shapes into a string
-            text = None
-            if isinstance(response, str):
-                text = response
-            elif hasattr(response, "content"):
-                text = getattr(response, "content")
-            elif isinstance(response, list) and response:
-                first = response[0]
-                if isinstance(first, str):
-                    text = first
-                elif isinstance(first, dict):
-                    # Try common keys
-                    text = first.get("content") or first.get("text")
-                elif hasattr(first, "content"):
-                    text = getattr(first, "content")
-            else:
-                # Some response shapes include a `generations` attribute
-                gens = getattr(response, "generations", None)
-                if gens:
-                    try:
-                        if gens and len(gens) > 0 and len(gens[0]) > 0:
-                            maybe = gens[0][0]
-                            text = getattr(maybe, "text", None) or getattr(maybe, "generation", None)
-                    except Exception:
-                        text = str(response)
-
-            text = text or str(response)
-
-            if isinstance(text, str) and "OK" in text.upper():
-                print_status("OpenAI API connection successful (via LangChain)", "ok")
-                return True
-            else:
-                print_status(f"Unexpected response: {text[:50]}", "warn")
-                return True
+        text = text or str(response)
 
+        if isinstance(text, str) and "OK" in text.upper():
+            print_status("OpenAI API connection successful (via LangChain)", "ok")
+            return True
+        else:
+            print_status(f"Unexpected response: {text[:50]}", "warn")
+            return True
+
+    except Exception as e:
+        print_status(f"Connection failed: {str(e)[:200]}", "fail")
+        return False
+
+
+@lru_cache(maxsize=1)
+def _utils_error() -> str | None:
+    """Import the repo's utils package once; return an error message, or None if it is usable.
+    
+    The package is loaded straight from its file rather than by putting the
+    repo root on sys.path, which would add a directory to search for every
+    later import in the process.
+    """
+    repo_root = os.path.dirname(os.path.abspath(__file__))
+    utils_dir = os.path.join(repo_root, "utils")
+    init_path = os.path.join(utils_dir, "__init__.py")
+    if not os.path.exists(init_path):
+        return f"{init_path} does not exist"
+    
+    loaded = sys.modules.get("utils")
+    if loaded is not None:
+        # Only reuse it if it is this repo's package, not a third-party
+        # "utils" or a utils.py imported earlier from somewhere else
+        loaded_path = getattr(loaded, "__file__", None)
+        if not loaded_path or os.path.abspath(loaded_path) != init_path:
+            return f"another 'utils' module is already imported ({loaded_path or 'no file'})"
+        utils = loaded
+    else:
+        spec = spec_from_file_location("utils", init_path, submodule_search_locations=[utils_dir])
+        utils = module_from_spec(spec)
+        # Registered before executing so the package's relative imports resolve
+        sys.modules["utils"] = utils
+        try:
+            spec.loader.exec_module(utils)
         except Exception as e:
-            print_status(f"Connection failed: {str(e)[:200]}", "fail")
-            return False
+            # Any error in the package is a failed check, not a crash
+            del sys.modules["utils"]
+            return f"{type(e).__name__}: {e}"
+    
+    # utils resolves names lazily, so check they are exported rather than
+    # importing the LLM helpers (and LangChain) just to look at them
+    missing = [name for name in ("load_environment", "get_langchain_llm") if name not in dir(utils)]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
 
 
 def check_utils_package():
     """Check if the utils package is accessible."""
     print_header("Utils Package")
     
-    # Add repo root to path
-    repo_root = os.path.dirname(os.path.abspath(__file__))
-    if repo_root not in sys.path:
-        sys.path.insert(0, repo_root)
-    
-    try:
-        from utils import load_environment, get_langchain_llm
+    error = _utils_error()
+    if error is None:
         print_status("utils package importable", "ok")
         return True
-    except ImportError as e:
-        print_status(f"utils package not found: {e}", "fail")
-        return False
+    print_status(f"utils package not found: {error}", "fail")
+    return False
 
 
 def check_env_file():
@@ -14,20 +14,49 @@ Checks:
 3. Python syntax in code cells
 4. Import statement availability
 5. Markdown cell structure
+
+Notebooks that passed every check and have not changed since are skipped,
+as long as the Python environment (interpreter and installed packages) is
+the same; delete .cache/verify_notebooks.json to force a full run.
 """
 
 import ast
+import hashlib
+import importlib
 import json
+import os
+import site
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import NamedTuple
 
-# ANSI colors
-GREEN = "\033[92m"
-RED = "\033[91m"
-YELLOW = "\033[93m"
-RESET = "\033[0m"
-BOLD = "\033[1m"
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - orjson is optional
+    from json import loads as _loads
+
+# Always importable, so never worth probing
+_STDLIB = frozenset(sys.stdlib_module_names)
+
+# ANSI colors, only when writing to a terminal that wants them
+_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+GREEN = "\033[92m" if _COLOR else ""
+RED = "\033[91m" if _COLOR else ""
+YELLOW = "\033[93m" if _COLOR else ""
+RESET = "\033[0m" if _COLOR else ""
+BOLD = "\033[1m" if _COLOR else ""
+
+# Pass/fail symbols, built once
+_PASS = f"{GREEN}✓{RESET}"
+_FAIL = f"{RED}✗{RESET}"
+
+
+# Notebooks that passed every check, keyed by path, with the mtime/size they
+# had then and the environment they were checked in; unchanged ones are
+# skipped on the next run
+CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "verify_notebooks.json"
 
 
 class VerificationResult(NamedTuple):
@@ -39,28 +68,28 @@ class VerificationResult(NamedTuple):
 
 def print_result(name: str, result: VerificationResult):
     """Print a verification result with color."""
-    symbol = f"{GREEN}✓{RESET}" if result.passed else f"{RED}✗{RESET}"
+    symbol = _PASS if result.passed else _FAIL
     print(f"  {symbol} {name}: {result.message}")
     if result.details and not result.passed:
         for line in result.details.split("\n"):
             print(f"      {YELLOW}{line}{RESET}")
 
 
-def verify_json_structure(notebook_path: Path) -> VerificationResult:
-    """Verify the notebook is valid JSON."""
+def verify_json_structure(notebook_path: Path) -> tuple[VerificationResult, dict | None]:
+    """Verify the notebook is valid JSON and return it parsed.
+    
+    The file is read and parsed once here; the other checks work on the
+    returned dict.
+    """
     try:
-        with open(notebook_path, 'r', encoding='utf-8') as f:
-            json.load(f)
-        return VerificationResult(True, "Valid JSON")
-    except json.JSONDecodeError as e:
-        return VerificationResult(False, "Invalid JSON", str(e))
+        nb = _loads(notebook_path.read_bytes())
+        return VerificationResult(True, "Valid JSON"), nb
+    except ValueError as e:  # JSONDecodeError (stdlib or orjson), bad UTF-8
+        return VerificationResult(False, "Invalid JSON", str(e)), None
 
 
-def verify_notebook_metadata(notebook_path: Path) -> VerificationResult:
+def verify_notebook_metadata(nb: dict) -> VerificationResult:
     """Verify required notebook metadata exists."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        nb = json.load(f)
-    
     issues = []
     
     if 'cells' not in nb:
@@ -78,29 +107,43 @@ def verify_notebook_metadata(notebook_path: Path) -> VerificationResult:
     return VerificationResult(True, f"Valid structure ({len(nb['cells'])} cells)")
 
 
-def verify_code_syntax(notebook_path: Path) -> VerificationResult:
-    """Verify Python syntax in all code cells."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        nb = json.load(f)
+def _parse_cells(nb: dict) -> list[tuple[int, ast.Module | SyntaxError]]:
+    """Parse every code cell once for the syntax and import checks.
     
-    errors = []
+    Returns (code cell index, tree or SyntaxError) pairs. Empty cells and
+    shell/magic cells are left out.
+    """
+    parsed = []
     code_cells = [c for c in nb.get('cells', []) if c.get('cell_type') == 'code']
     
     for i, cell in enumerate(code_cells):
         source = ''.join(cell.get('source', []))
         
         # Skip empty cells
-        if not source.strip():
+        stripped = source.lstrip()
+        if not stripped:
             continue
         
         # Skip cells that are just shell commands
-        if source.strip().startswith('!') or source.strip().startswith('%'):
+        if stripped[0] in '!%':
             continue
         
         try:
-            ast.parse(source)
+            parsed.append((i, ast.parse(source)))
         except SyntaxError as e:
-            errors.append(f"Cell {i+1}: {e.msg} (line {e.lineno})")
+            parsed.append((i, e))
+    
+    return parsed
+
+
+def verify_code_syntax(nb: dict, parsed_cells: list) -> VerificationResult:
+    """Verify Python syntax in all code cells."""
+    errors = [
+        f"Cell {i+1}: {tree.msg} (line {tree.lineno})"
+        for i, tree in parsed_cells
+        if isinstance(tree, SyntaxError)
+    ]
+    code_cells = [c for c in nb.get('cells', []) if c.get('cell_type') == 'code']
     
     if errors:
         return VerificationResult(
@@ -112,40 +155,63 @@ def verify_code_syntax(notebook_path: Path) -> VerificationResult:
     return VerificationResult(True, f"All {len(code_cells)} code cells valid")
 
 
-def verify_imports(notebook_path: Path) -> VerificationResult:
-    """Check if imported modules are available (without executing)."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        nb = json.load(f)
+@lru_cache(maxsize=None)
+def _probe_import(name: str) -> bool:
+    """Return whether a top-level module can be imported.
     
+    Cached per process, so modules shared by several notebooks are only
+    probed once.
+    """
+    try:
+        importlib.import_module(name)
+        return True
+    except ImportError:
+        return False
+
+
+def _top_level_statements(tree: ast.Module):
+    """Yield a cell's top-level statements, one level into if/try blocks.
+    
+    Notebook imports sit at cell top level, sometimes behind an
+    ``if``/``try`` guard, so there is no need to walk function bodies and
+    expressions.
+    """
+    for node in tree.body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from node.body
+            yield from node.orelse
+        elif isinstance(node, ast.Try):
+            yield from node.body
+            for handler in node.handlers:
+                yield from handler.body
+            yield from node.orelse
+            yield from node.finalbody
+
+
+def verify_imports(parsed_cells: list) -> VerificationResult:
+    """Check if imported modules are available (without executing)."""
     # Extract import statements
     imports = set()
-    for cell in nb.get('cells', []):
-        if cell.get('cell_type') != 'code':
-            continue
-        
-        source = ''.join(cell.get('source', []))
-        try:
-            tree = ast.parse(source)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        imports.add(alias.name.split('.')[0])
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        imports.add(node.module.split('.')[0])
-        except SyntaxError:
+    for _, tree in parsed_cells:
+        if isinstance(tree, SyntaxError):
             continue
+        for node in _top_level_statements(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    imports.add(alias.name.split('.')[0])
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    imports.add(node.module.split('.')[0])
     
     # Check availability
     missing = []
     for module in imports:
-        # Skip relative imports and common stdlib
-        if module.startswith('.'):
+        # Skip relative imports, the stdlib and anything already loaded
+        if module.startswith('.') or module in _STDLIB or module in sys.modules:
             continue
         
-        try:
-            __import__(module)
-        except ImportError:
+        if not _probe_import(module):
             missing.append(module)
     
     if missing:
@@ -158,13 +224,10 @@ def verify_imports(notebook_path: Path) -> VerificationResult:
     return VerificationResult(True, f"All {len(imports)} imports available")
 
 
-def verify_markdown_cells(notebook_path: Path) -> VerificationResult:
+def verify_markdown_cells(nb: dict) -> VerificationResult:
     """Verify markdown cells have content."""
-    with open(notebook_path, 'r', encoding='utf-8') as f:
-        nb = json.load(f)
-    
     md_cells = [c for c in nb.get('cells', []) if c.get('cell_type') == 'markdown']
-    empty_count = sum(1 for c in md_cells if not ''.join(c.get('source', [])).strip())
+    empty_count = sum(1 for c in md_cells if not any(seg.strip() for seg in c.get('source', [])))
     
     if empty_count > 0:
         return VerificationResult(
@@ -181,18 +244,58 @@ def verify_notebook(notebook_path: Path) -> dict:
     results = {}
     
     # JSON structure (must pass for other checks)
-    results['json'] = verify_json_structure(notebook_path)
+    results['json'], nb = verify_json_structure(notebook_path)
     if not results['json'].passed:
         return results
     
-    results['metadata'] = verify_notebook_metadata(notebook_path)
-    results['syntax'] = verify_code_syntax(notebook_path)
-    results['imports'] = verify_imports(notebook_path)
-    results['markdown'] = verify_markdown_cells(notebook_path)
+    results['metadata'] = verify_notebook_metadata(nb)
+    parsed_cells = _parse_cells(nb)
+    results['syntax'] = verify_code_syntax(nb, parsed_cells)
+    results['imports'] = verify_imports(parsed_cells)
+    results['markdown'] = verify_markdown_cells(nb)
     
     return results
 
 
+def _load_cache() -> dict:
+    """Load the passed-notebook cache, or an empty one."""
+    try:
+        return json.loads(CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache: dict):
+    """Write the passed-notebook cache back to disk."""
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CACHE_PATH.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+
+@lru_cache(maxsize=None)
+def _environment_key() -> str:
+    """Fingerprint the interpreter and its installed packages.
+
+    The import check depends on the environment as much as on the notebook,
+    so a pass recorded in another venv, or before a package was removed,
+    must not be reused. Installing, upgrading or removing a package changes
+    its site-packages directory, so the directories' mtimes stand in for the
+    package list without reading every distribution's metadata.
+    """
+    parts = [sys.executable, sys.prefix]
+    for directory in (*site.getsitepackages(), site.getusersitepackages()):
+        try:
+            parts.append(f"{directory}={os.stat(directory).st_mtime_ns}")
+        except OSError:
+            continue
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:16]
+
+
+def _cache_key(notebook_path: Path) -> str:
+    """Fingerprint a notebook file by modification time and size, plus the environment."""
+    stat = notebook_path.stat()
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{_environment_key()}"
+
+
 def main():
     """Verify all workshop notebooks."""
     print(f"\n{BOLD}Notebook Verification for Agents Workshop{RESET}")
@@ -210,19 +313,41 @@ def main():
     
     all_passed = True
     
-    for nb_path in sorted(notebooks):
-        relative_path = nb_path.relative_to(repo_root)
+    notebooks.sort()
+    cache = _load_cache()
+    keys = {str(nb_path.relative_to(repo_root)): _cache_key(nb_path) for nb_path in notebooks}
+    all_results = {
+        name: {'cache': VerificationResult(True, "Unchanged since last passing run")}
+        for name, key in keys.items()
+        if cache.get(name) == key
+    }
+    
+    # Notebooks are independent, so verify them concurrently; results are
+    # printed from this thread afterwards to keep output readable
+    to_check = [nb_path for nb_path in notebooks if str(nb_path.relative_to(repo_root)) not in all_results]
+    if to_check:
+        with ThreadPoolExecutor(max_workers=min(8, len(to_check))) as executor:
+            for nb_path, results in zip(to_check, executor.map(verify_notebook, to_check)):
+                all_results[str(nb_path.relative_to(repo_root))] = results
+    
+    for nb_path in notebooks:
+        relative_path = str(nb_path.relative_to(repo_root))
         print(f"{BOLD}{relative_path}{RESET}")
         
-        results = verify_notebook(nb_path)
-        
+        results = all_results[relative_path]
         for check_name, result in results.items():
             print_result(check_name, result)
-            if not result.passed:
-                all_passed = False
+        
+        if all(result.passed for result in results.values()):
+            cache[relative_path] = keys[relative_path]
+        else:
+            cache.pop(relative_path, None)
+            all_passed = False
         
         print()
     
+    _save_cache(cache)
+    
     # Summary
     print("=" * 50)
     if all_passed:
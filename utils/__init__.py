@@ -7,42 +7,84 @@ Quick Start:
     >>> from utils import load_environment, get_langchain_llm
     >>> load_environment()
     >>> llm = get_langchain_llm("gpt-4o-mini")
+
+Names are resolved lazily (PEP 562): each submodule is imported the first
+time one of its names is used, so ``from utils import load_environment``
+does not pull in the LLM, image or audio SDKs. Set ``UTILS_EAGER_IMPORT=1``
+to import everything up front, e.g. to surface import errors in CI.
 """
-from .settings import load_environment, load_dotenv, display, Markdown, IPyImage, PlantUML
-from .models import RECOMMENDED_MODELS, recommended_models_table
-from .llm import (
-    setup_llm_client, async_setup_llm_client,
-    get_completion, get_completion_compat,
-    async_get_completion, async_get_completion_compat,
-    get_vision_completion, get_vision_completion_compat,
-    async_get_vision_completion, async_get_vision_completion_compat,
-    clean_llm_output,
-    prompt_enhancer, prompt_enhancer_compat,
-    # Workshop helper functions
-    get_langchain_llm, get_autogen_config, get_crewai_llm,
-)
-from .image_gen import (
-    get_image_generation_completion, get_image_generation_completion_compat,
-    async_get_image_generation_completion, async_get_image_generation_completion_compat,
-    get_image_edit_completion, get_image_edit_completion_compat,
-    async_get_image_edit_completion, async_get_image_edit_completion_compat,
-)
-from .audio import (
-    transcribe_audio,
-    transcribe_audio_compat,
-    async_transcribe_audio,
-    async_transcribe_audio_compat,
-)
-from .artifacts import *  # noqa: F401,F403 re-export for backwards compatibility
-from .errors import *  # noqa: F401,F403
-from .logging import *  # noqa: F401,F403
-from .plantuml import render_plantuml_diagram
+import importlib
+import os
+
+# Public name -> submodule that defines it
+_LAZY = {
+    # Environment and display
+    **dict.fromkeys(
+        ('load_environment', 'load_dotenv', 'display', 'Markdown', 'IPyImage', 'PlantUML'),
+        'settings',
+    ),
+    # Model registry
+    **dict.fromkeys(
+        ('RECOMMENDED_MODELS', 'recommended_models_table', 'iter_recommended_models', 'rebuild_model_index'),
+        'models',
+    ),
+    # LLM clients, completions and workshop helpers
+    **dict.fromkeys(
+        (
+            'setup_llm_client', 'async_setup_llm_client',
+            'get_completion', 'get_completion_compat',
+            'async_get_completion', 'async_get_completion_compat',
+            'get_vision_completion', 'get_vision_completion_compat',
+            'async_get_vision_completion', 'async_get_vision_completion_compat',
+            'clean_llm_output',
+            'prompt_enhancer', 'prompt_enhancer_compat',
+            'get_langchain_llm', 'get_autogen_config', 'get_crewai_llm',
+        ),
+        'llm',
+    ),
+    # Image generation
+    **dict.fromkeys(
+        (
+            'get_image_generation_completion', 'get_image_generation_completion_compat',
+            'async_get_image_generation_completion', 'async_get_image_generation_completion_compat',
+            'get_image_edit_completion', 'get_image_edit_completion_compat',
+            'async_get_image_edit_completion', 'async_get_image_edit_completion_compat',
+        ),
+        'image_gen',
+    ),
+    # Audio
+    **dict.fromkeys(
+        (
+            'transcribe_audio', 'transcribe_audio_compat',
+            'async_transcribe_audio', 'async_transcribe_audio_compat',
+        ),
+        'audio',
+    ),
+    'render_plantuml_diagram': 'plantuml',
+    # Formerly star re-exports, kept for backwards compatibility
+    **dict.fromkeys(
+        (
+            'set_artifacts_dir', 'get_artifacts_dir', 'resolve_artifact_path',
+            'save_artifact', 'load_artifact', 'detect_project_root', '_find_project_root',
+        ),
+        'artifacts',
+    ),
+    **dict.fromkeys(
+        (
+            'UtilsError', 'ArtifactError', 'ArtifactSecurityError', 'ArtifactNotFoundError',
+            'ProviderOperationError', 'CLIENT_NOT_INITIALIZED', 'UNSUPPORTED_PROVIDER',
+        ),
+        'errors',
+    ),
+    'get_logger': 'logging',
+}
 
 __all__ = [
     # Environment and display
     'load_environment', 'load_dotenv', 'display', 'Markdown', 'IPyImage', 'PlantUML',
     # Model registry
-    'RECOMMENDED_MODELS', 'recommended_models_table',
+    'RECOMMENDED_MODELS', 'recommended_models_table', 'iter_recommended_models',
+    'rebuild_model_index',
     # Workshop helpers (use these in labs!)
     'get_langchain_llm', 'get_autogen_config', 'get_crewai_llm',
     # Low-level client setup
@@ -64,3 +106,22 @@ __all__ = [
     'clean_llm_output', 'prompt_enhancer', 'prompt_enhancer_compat',
     'render_plantuml_diagram',
 ]
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+if os.getenv("UTILS_EAGER_IMPORT") == "1":
+    for _name in _LAZY:
+        __getattr__(_name)
@@ -3,10 +3,18 @@ Model metadata and helper utilities for the Crafting Custom Agents Workshop.
 
 This module provides a registry of recommended LLM models with their capabilities
 and metadata, plus helper functions to display and filter models.
+
+The filters read an index of RECOMMENDED_MODELS built at import, and
+recommended_models_table caches its results. After adding or editing
+entries at runtime, call rebuild_model_index() so the changes show up:
+
+    RECOMMENDED_MODELS["my-model"] = {"provider": "openai", "text_generation": True}
+    rebuild_model_index()
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, NamedTuple
 
 from .settings import display, Markdown
 
@@ -218,6 +226,248 @@ RECOMMENDED_MODELS: Dict[str, Dict[str, Any]] = {
 }
 
 
+# Task names accepted by recommended_models_table -> capability they select
+_TASK_ALIASES = {
+    "vision": "vision", "multimodal": "vision", "vl": "vision",
+    "image": "image_generation", "image_generation": "image_generation",
+    "image-generation": "image_generation",
+    "image_modification": "image_modification", "image-edit": "image_modification",
+    "image_edit": "image_modification", "image-editing": "image_modification",
+    "editing": "image_modification",
+    "audio": "audio_transcription", "speech": "audio_transcription",
+    "audio_transcription": "audio_transcription", "stt": "audio_transcription",
+    "text": "text_generation",
+}
+
+# --- Filter Index ---
+# Capability flags that recommended_models_table can filter on, in table column order
+_CAPABILITIES = (
+    "text_generation",
+    "vision",
+    "image_generation",
+    "image_modification",
+    "audio_transcription",
+)
+
+
+_HEADER = (
+    "| Model | Provider | Text | Vision | Image Gen | Image Edit | Audio Transcription | Context Window | Max Output Tokens |\n"
+    "|---|---|---|---|---|---|---|---|---|\n"
+)
+
+# Table cell for a capability flag, indexed by the bool
+_TICK = ("❌", "✅")
+
+
+def _fmt_num(x: Any) -> str:
+    """Format a token count for the table, with thousands separators."""
+    if x is None:
+        return "-"
+    try:
+        return f"{int(x):,}"
+    except Exception:
+        return str(x)
+
+
+# Older key names -> current ones
+_LEGACY_KEYS = {
+    "context_window": "context_window_tokens",
+    "max_output_tokens": "output_tokens",
+}
+
+
+def _normalize_keys(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename legacy keys in a model entry in place, so lookups need no fallback."""
+    for legacy_key, key in _LEGACY_KEYS.items():
+        if legacy_key in cfg:
+            value = cfg.pop(legacy_key)
+            if cfg.get(key) is None:
+                cfg[key] = value
+    return cfg
+
+
+def _as_count(x: Any) -> int:
+    """Token count as an int for filtering; -1 when unknown, so any minimum rejects it."""
+    if x is None:
+        return -1
+    try:
+        return int(x)
+    except (TypeError, ValueError):
+        return -1
+
+
+class _ModelIndex(NamedTuple):
+    """Column-oriented copy of RECOMMENDED_MODELS, in sorted-name order."""
+    names: tuple[str, ...]
+    providers: tuple[str, ...]  # lowercased
+    flags: Dict[str, tuple[bool, ...]]  # capability -> per-model flag
+    context: tuple[int, ...]  # -1 when unknown
+    max_output: tuple[int, ...]  # -1 when unknown
+    rows: tuple[str, ...]  # each model's markdown table row
+    capability_bitmaps: Dict[str, int]
+    provider_bitmaps: Dict[str, int]
+
+
+def _build_index(models: Dict[str, Dict[str, Any]]) -> _ModelIndex:
+    """Index the model registry for filtering.
+
+    Each model gets a bit position in sorted-name order. Every capability and
+    provider maps to an int bitmap with the bits of its models set, so any
+    combination of filters reduces to a few integer ANDs. Per-model values
+    are stored as parallel tuples, so rows are read by position instead of
+    through a dict lookup per field.
+    """
+    names = tuple(sorted(models))
+    configs = [_normalize_keys(models[name]) for name in names]
+    providers = tuple((cfg.get("provider") or "").lower() for cfg in configs)
+    flags = {
+        capability: tuple(bool(cfg.get(capability, False)) for cfg in configs)
+        for capability in _CAPABILITIES
+    }
+
+    capability_bitmaps = {
+        capability: sum(1 << i for i, flag in enumerate(column) if flag)
+        for capability, column in flags.items()
+    }
+    provider_bitmaps: Dict[str, int] = {}
+    for i, provider in enumerate(providers):
+        provider_bitmaps[provider] = provider_bitmaps.get(provider, 0) | 1 << i
+
+    context = tuple(cfg.get("context_window_tokens") for cfg in configs)
+    max_output = tuple(cfg.get("output_tokens") for cfg in configs)
+
+    rows = tuple(
+        f"| {name} | {provider or '-'} | "
+        + "".join(f"{_TICK[flags[capability][i]]} | " for capability in _CAPABILITIES)
+        + f"{_fmt_num(context[i])} | {_fmt_num(max_output[i])} |"
+        for i, (name, provider) in enumerate(zip(names, providers))
+    )
+
+    return _ModelIndex(
+        names=names,
+        providers=providers,
+        flags=flags,
+        context=tuple(_as_count(x) for x in context),
+        max_output=tuple(_as_count(x) for x in max_output),
+        rows=rows,
+        capability_bitmaps=capability_bitmaps,
+        provider_bitmaps=provider_bitmaps,
+    )
+
+
+_INDEX = _build_index(RECOMMENDED_MODELS)
+
+
+def rebuild_model_index() -> None:
+    """Re-index RECOMMENDED_MODELS; call after adding or editing entries at runtime."""
+    global _INDEX
+    _INDEX = _build_index(RECOMMENDED_MODELS)
+    _build_table.cache_clear()
+
+
+def _iter_matching(index: _ModelIndex, mask: int,
+                   min_context: int | None, min_output_tokens: int | None) -> Iterator[int]:
+    """Yield, in order, the positions of models in ``mask`` that meet the token limits."""
+    while mask:
+        low = mask & -mask
+        mask ^= low
+        i = low.bit_length() - 1
+
+        if min_context and index.context[i] < min_context:
+            continue
+        if min_output_tokens and index.max_output[i] < min_output_tokens:
+            continue
+
+        yield i
+
+
+def _filter_mask(task: str | None,
+                 provider: str | None,
+                 text_generation: bool | None,
+                 vision: bool | None,
+                 image_generation: bool | None,
+                 audio_transcription: bool | None,
+                 image_modification: bool | None) -> int:
+    """Bitmap of the models in _INDEX that pass the task, provider and capability filters."""
+    capability = _TASK_ALIASES.get(task.lower()) if task else None
+    if capability == "vision" and vision is None:
+        vision = True
+    elif capability == "image_generation" and image_generation is None:
+        image_generation = True
+    elif capability == "image_modification" and image_modification is None:
+        image_modification = True
+    elif capability == "audio_transcription" and audio_transcription is None:
+        audio_transcription = True
+    elif capability == "text_generation" and text_generation is None:
+        text_generation = True
+        vision = False if vision is None else vision
+        image_generation = False if image_generation is None else image_generation
+        image_modification = False if image_modification is None else image_modification
+        audio_transcription = False if audio_transcription is None else audio_transcription
+
+    index = _INDEX
+    mask = (1 << len(index.names)) - 1
+    if provider:
+        mask &= index.provider_bitmaps.get(provider.lower(), 0)
+    for capability, wanted in (
+        ("text_generation", text_generation),
+        ("vision", vision),
+        ("image_generation", image_generation),
+        ("image_modification", image_modification),
+        ("audio_transcription", audio_transcription),
+    ):
+        if wanted is not None:
+            bitmap = index.capability_bitmaps[capability]
+            mask &= bitmap if wanted else ~bitmap
+    return mask
+
+
+@lru_cache(maxsize=128)
+def _build_table(task: str | None,
+                 provider: str | None,
+                 text_generation: bool | None,
+                 vision: bool | None,
+                 image_generation: bool | None,
+                 audio_transcription: bool | None,
+                 min_context: int | None,
+                 min_output_tokens: int | None,
+                 image_modification: bool | None) -> str | None:
+    """Build the filtered markdown table, or None if no model matches.
+
+    The result depends only on the arguments and the index, so it is
+    cached per filter combination; rebuild_model_index() clears the cache.
+    """
+    index = _INDEX
+    mask = _filter_mask(task, provider, text_generation, vision, image_generation,
+                        audio_transcription, image_modification)
+    body = "\n".join(index.rows[i] for i in _iter_matching(index, mask, min_context, min_output_tokens))
+    if not body:
+        return None
+    return _HEADER + body
+
+
+def iter_recommended_models(task: str | None = None,
+                            provider: str | None = None,
+                            text_generation: bool | None = None,
+                            vision: bool | None = None,
+                            image_generation: bool | None = None,
+                            audio_transcription: bool | None = None,
+                            min_context: int | None = None,
+                            min_output_tokens: int | None = None,
+                            image_modification: bool | None = None) -> Iterator[str]:
+    """Yield the names of recommended models matching the filters, in sorted order.
+
+    Takes the same filters as recommended_models_table. Names are produced
+    lazily, so ``next(iter_recommended_models(vision=True), None)`` stops at
+    the first match.
+    """
+    index = _INDEX
+    mask = _filter_mask(task, provider, text_generation, vision, image_generation,
+                        audio_transcription, image_modification)
+    for i in _iter_matching(index, mask, min_context, min_output_tokens):
+        yield index.names[i]
+
+
 def recommended_models_table(task: str | None = None,
                              provider: str | None = None,
                              text_generation: bool | None = None,
@@ -226,84 +476,21 @@ def recommended_models_table(task: str | None = None,
                              audio_transcription: bool | None = None,
                              min_context: int | None = None,
                              min_output_tokens: int | None = None,
-                             image_modification: bool | None = None) -> str:
-    """Return a markdown table of recommended models filtered by capabilities."""
-    if task:
-        t = task.lower()
-        if t in {"vision", "multimodal", "vl"} and vision is None:
-            vision = True
-        elif t in {"image", "image_generation", "image-generation"} and image_generation is None:
-            image_generation = True
-        elif t in {"image_modification", "image-edit", "image_edit", "image-editing", "editing"} and image_modification is None:
-            image_modification = True
-        elif t in {"audio", "speech", "audio_transcription", "stt"} and audio_transcription is None:
-            audio_transcription = True
-        elif t == "text" and text_generation is None:
-            text_generation = True
-            vision = False if vision is None else vision
-            image_generation = False if image_generation is None else image_generation
-            image_modification = False if image_modification is None else image_modification
-            audio_transcription = False if audio_transcription is None else audio_transcription
-
-    rows = []
-    for model_name in sorted(RECOMMENDED_MODELS.keys()):
-        cfg = RECOMMENDED_MODELS[model_name]
-        model_provider = (cfg.get("provider") or "").lower()
-        model_text = cfg.get("text_generation", False)
-        model_vision = cfg.get("vision", False)
-        model_image = cfg.get("image_generation", False)
-        model_image_mod = cfg.get("image_modification", False)
-        model_audio = cfg.get("audio_transcription", False)
-
-        context = cfg.get("context_window_tokens")
-        if context is None:
-            context = cfg.get("context_window")
-
-        max_tokens = cfg.get("output_tokens")
-        if max_tokens is None:
-            max_tokens = cfg.get("max_output_tokens")
-
-        if provider and model_provider != provider.lower():
-            continue
-        if text_generation is not None and bool(model_text) != bool(text_generation):
-            continue
-        if vision is not None and bool(model_vision) != bool(vision):
-            continue
-        if image_generation is not None and bool(model_image) != bool(image_generation):
-            continue
-        if image_modification is not None and bool(model_image_mod) != bool(image_modification):
-            continue
-        if audio_transcription is not None and bool(model_audio) != bool(audio_transcription):
-            continue
-        if min_context and (context is None or (isinstance(context, int) and context < min_context)):
-            continue
-        if min_output_tokens and (max_tokens is None or (isinstance(max_tokens, int) and max_tokens < min_output_tokens)):
-            continue
+                             image_modification: bool | None = None,
+                             return_string: bool = True) -> str | None:
+    """Display a markdown table of recommended models filtered by capabilities.
 
-        def _fmt_num(x: Any) -> str:
-            if x is None:
-                return "-"
-            try:
-                return f"{int(x):,}"
-            except Exception:
-                return str(x)
-
-        rows.append(
-            f"| {model_name} | {model_provider or '-'} | {'✅' if model_text else '❌'} | "
-            f"{'✅' if model_vision else '❌'} | {'✅' if model_image else '❌'} | "
-            f"{'✅' if model_image_mod else '❌'} | {'✅' if model_audio else '❌'} | "
-            f"{_fmt_num(context)} | {_fmt_num(max_tokens)} |"
-        )
-
-    if not rows:
-        return "No models match the specified criteria."
-
-    header = (
-        "| Model | Provider | Text | Vision | Image Gen | Image Edit | Audio Transcription | Context Window | Max Output Tokens |\n"
-        "|---|---|---|---|---|---|---|---|---|\n"
+    Returns the table, or a message if no model matches. Pass
+    ``return_string=False`` to only display it, e.g. as the last line of a
+    notebook cell where the returned string would be echoed again.
+    """
+    table = _build_table(
+        task, provider, text_generation, vision, image_generation,
+        audio_transcription, min_context, min_output_tokens, image_modification,
     )
-    table = header + "\n".join(rows)
+    if table is None:
+        return "No models match the specified criteria."
     display(Markdown(table))
-    return table
+    return table if return_string else None
 
-__all__ = ['RECOMMENDED_MODELS', 'recommended_models_table']
+__all__ = ['RECOMMENDED_MODELS', 'recommended_models_table', 'iter_recommended_models', 'rebuild_model_index']